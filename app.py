@@ -3,6 +3,11 @@ SENTINEL AI Agent - Multi-Page Application
 Advanced Financial Transaction Monitoring & Analysis Platform
 """
 import streamlit as st
+import plotly.io as pio
+from pathlib import Path
+
+# Serialize every page's Plotly figures with orjson (set once for the process)
+pio.json.config.default_engine = "orjson"
 
 # Enhanced page configuration
 st.set_page_config(
@@ -29,44 +34,14 @@ st.set_page_config(
     }
 )
 
-# Custom CSS for better styling
-st.markdown("""
-<style>
-    /* Global app styling */
-    .stApp {
-        background-color: #0e1117;
-    }
-    
-    /* Navigation styling */
-    .stSidebar {
-        background-color: #1f2937;
-    }
-    
-    /* Enhanced navigation button styling */
-    .stSelectbox > div > div {
-        background-color: #1f2937;
-        border: 1px solid #374151;
-        border-radius: 8px;
-    }
-    
-    /* Professional title styling */
-    .main-title {
-        color: #a78bfa;
-        font-size: 3rem;
-        font-weight: 700;
-        text-align: center;
-        margin-bottom: 2rem;
-        text-shadow: 0 0 20px rgba(167, 139, 250, 0.3);
-    }
-    
-    .subtitle {
-        color: #9ca3af;
-        font-size: 1.2rem;
-        text-align: center;
-        margin-bottom: 3rem;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS for better styling (read once per server process)
+@st.cache_resource
+def _load_css() -> str:
+    css_path = Path(__file__).parent / "static" / "app.css"
+    return f"<style>{css_path.read_text(encoding='utf-8')}</style>"
+
+
+st.markdown(_load_css(), unsafe_allow_html=True)
 
 # Welcome header (only show on main page)
 if 'selected_page' not in st.session_state:
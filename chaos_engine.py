@@ -3,278 +3,298 @@ CHAOS ENGINE - Synthetic Transaction Data Generator
 Generates 2500 realistic payment transactions with 4 embedded intelligence traps.
 """
 
-import random
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+import pyarrow as pa
+from pyarrow import csv as pacsv
+from pyarrow import parquet as pq
+from datetime import datetime
 import json
+import orjson
 import os
+from types import SimpleNamespace
 import config
 
-# Set random seed for reproducibility
-random.seed(config.RANDOM_SEED)
-np.random.seed(config.RANDOM_SEED)
+# Single seeded generator for reproducibility; every draw is a batched call on it
+_RNG = np.random.default_rng(config.RANDOM_SEED)
+_ERROR_CODES_ARR = np.asarray(config.ALL_ERROR_CODES)
 
 
-def generate_transaction_id(index):
-    """Generate unique transaction ID"""
-    return f"TXN{index:05d}"
+def generate_transaction_ids(index):
+    """Generate unique transaction IDs for an array of row indices"""
+    return "TXN" + pd.Series(index).astype(str).str.zfill(5)
 
 
-def generate_timestamp(index, total):
-    """Generate evenly distributed timestamps over 24-hour window"""
-    # Distribute transactions evenly across the time window
-    seconds_elapsed = (config.DURATION_HOURS * 3600 * index) / total
-    return config.START_TIME + timedelta(seconds=seconds_elapsed)
+def generate_amounts(n):
+    """Generate n transaction amounts in one lognormal draw"""
+    amounts = _RNG.lognormal(mean=np.log(config.AMOUNT_MEAN), sigma=0.8, size=n)
+    amounts = np.clip(amounts, config.AMOUNT_MIN, config.AMOUNT_MAX)
+    return np.round(amounts, 2)
 
 
-def generate_amount():
-    """Generate transaction amount using lognormal distribution (realistic)"""
-    # Lognormal gives us many small transactions, few large ones
-    amount = np.random.lognormal(mean=np.log(config.AMOUNT_MEAN), sigma=0.8)
-    # Clip to min/max range
-    amount = max(config.AMOUNT_MIN, min(config.AMOUNT_MAX, amount))
-    return round(amount, 2)
-
-
-def generate_latency(is_failing=False, multiplier=1.0):
-    """Generate latency with occasional outliers"""
-    if random.random() < config.LATENCY_OUTLIER_RATE:
-        # Outlier latency
-        latency = random.randint(config.LATENCY_OUTLIER_THRESHOLD_MS, 5000)
-    else:
-        # Normal latency
-        latency = int(np.random.normal(config.LATENCY_MEAN_MS, config.LATENCY_STD_MS))
-        latency = max(50, latency)  # Minimum 50ms
+def generate_latencies(n, multiplier=1.0):
+    """Generate n latencies with occasional outliers in one vectorized pass"""
+    is_outlier = _RNG.random(n) < config.LATENCY_OUTLIER_RATE
+    outliers = _RNG.integers(config.LATENCY_OUTLIER_THRESHOLD_MS, 5001, size=n)
+    normal = _RNG.normal(config.LATENCY_MEAN_MS, config.LATENCY_STD_MS, size=n).astype(np.int64)
+    normal = np.maximum(50, normal)  # Minimum 50ms
+    latencies = np.where(is_outlier, outliers, normal)
     
     # Apply multiplier for pattern-based failures
-    if is_failing:
-        latency = int(latency * multiplier)
+    if multiplier != 1.0:
+        latencies = (latencies * multiplier).astype(np.int64)
     
-    return latency
+    return latencies
+
+
+# Patterns are checked in this priority order; a transaction matches at most one
+PATTERN_PRIORITY = ["whale_trap", "margin_destroyer", "canary_spike", "weekend_vip"]
 
 
-def matches_pattern(txn, pattern_name):
-    """Check if transaction matches a pattern's conditions"""
-    pattern = config.PATTERNS[pattern_name]
+def compile_pattern(pattern):
+    """Flatten a pattern config dict into a namespace with prebound attributes"""
     conditions = pattern["conditions"]
+    phase1 = pattern.get("phase_1")
+    phase2 = pattern.get("phase_2")
+    return SimpleNamespace(
+        bank=conditions.get("bank"),
+        card_type=conditions.get("card_type"),
+        customer_tier=conditions.get("customer_tier"),
+        merchant_category=conditions.get("merchant_category"),
+        amount_min=conditions.get("amount_min"),
+        amount_max=conditions.get("amount_max"),
+        hour_set=frozenset(conditions.get("hour_range", ())),
+        failure_rate=pattern.get("failure_rate", 0.0),
+        error_code=pattern.get("error_code"),
+        error_diversity=pattern.get("error_diversity", 0),
+        latency_multiplier=pattern.get("latency_multiplier", 1.0),
+        phase1=SimpleNamespace(**phase1) if phase1 else None,
+        phase2=SimpleNamespace(**phase2) if phase2 else None
+    )
+
+
+# Resolved once at import so mask building never walks the nested config dicts
+PATTERN_CACHE = {name: compile_pattern(pattern) for name, pattern in config.PATTERNS.items()}
+
+
+def pattern_mask(df, pattern_name):
+    """Boolean mask of transactions matching a pattern's conditions"""
+    p = PATTERN_CACHE[pattern_name]
+    hour = df["timestamp"].dt.hour
     
     # Check whale_trap
     if pattern_name == "whale_trap":
         return (
-            txn["bank"] == conditions["bank"] and
-            txn["card_type"] == conditions["card_type"] and
-            txn["amount"] > conditions["amount_min"] and
-            txn["timestamp"].hour in conditions["hour_range"]
+            (df["bank"] == p.bank) &
+            (df["card_type"] == p.card_type) &
+            (df["amount"] > p.amount_min) &
+            hour.isin(p.hour_set)
         )
     
     # Check margin_destroyer
     elif pattern_name == "margin_destroyer":
         return (
-            txn["bank"] == conditions["bank"] and
-            txn["amount"] < conditions["amount_max"]
+            (df["bank"] == p.bank) &
+            (df["amount"] < p.amount_max)
         )
     
     # Check canary_spike (Phase 1 or Phase 2)
     elif pattern_name == "canary_spike":
-        hour = txn["timestamp"].hour
-        minute = txn["timestamp"].minute
-        
-        phase1 = pattern["phase_1"]
-        phase2 = pattern["phase_2"]
+        minute = df["timestamp"].dt.minute
         
         # Phase 1: 18:00-18:30
-        in_phase1 = (hour == phase1["start_hour"] and minute < phase1["duration_minutes"])
+        in_phase1 = (hour == p.phase1.start_hour) & (minute < p.phase1.duration_minutes)
         
         # Phase 2: 19:00-20:00
-        in_phase2 = (hour >= phase2["start_hour"] and hour < phase2["start_hour"] + 1)
+        in_phase2 = (hour >= p.phase2.start_hour) & (hour < p.phase2.start_hour + 1)
         
         return (
-            txn["bank"] == conditions["bank"] and
-            txn["card_type"] == conditions["card_type"] and
-            (in_phase1 or in_phase2)
+            (df["bank"] == p.bank) &
+            (df["card_type"] == p.card_type) &
+            (in_phase1 | in_phase2)
         )
     
     # Check weekend_vip
     elif pattern_name == "weekend_vip":
         # Check if it's a weekend (Saturday=5, Sunday=6)
-        is_weekend = txn["timestamp"].weekday() >= 5
+        is_weekend = df["timestamp"].dt.weekday >= 5
         
         return (
-            txn["customer_tier"] == conditions["customer_tier"] and
-            txn["merchant_category"] == conditions["merchant_category"] and
+            (df["customer_tier"] == p.customer_tier) &
+            (df["merchant_category"] == p.merchant_category) &
             is_weekend
         )
     
-    return False
+    return pd.Series(False, index=df.index)
 
 
-def should_fail_for_pattern(txn, pattern_name):
-    """Determine if transaction should fail based on pattern logic"""
-    pattern = config.PATTERNS[pattern_name]
+def pattern_failure_rates(df, pattern_name):
+    """Per-transaction failure probability under a pattern's logic"""
+    p = PATTERN_CACHE[pattern_name]
     
     if pattern_name == "canary_spike":
         # Special handling for two-phase pattern
-        hour = txn["timestamp"].hour
-        minute = txn["timestamp"].minute
-        
-        phase1 = pattern["phase_1"]
-        phase2 = pattern["phase_2"]
-        
-        # Phase 1: 18% failure rate
-        if hour == phase1["start_hour"] and minute < phase1["duration_minutes"]:
-            return random.random() < phase1["failure_rate"]
-        
-        # Phase 2: 100% failure rate
-        if hour >= phase2["start_hour"]:
-            return random.random() < phase2["failure_rate"]
+        hour = df["timestamp"].dt.hour.to_numpy()
+        minute = df["timestamp"].dt.minute.to_numpy()
         
-        return False
+        # Phase 1: 18% failure rate, Phase 2: 100% failure rate
+        in_phase1 = (hour == p.phase1.start_hour) & (minute < p.phase1.duration_minutes)
+        in_phase2 = hour >= p.phase2.start_hour
+        return np.select(
+            [in_phase1, in_phase2],
+            [p.phase1.failure_rate, p.phase2.failure_rate],
+            default=0.0
+        )
     
-    else:
-        # Standard failure rate check
-        return random.random() < pattern["failure_rate"]
+    # Standard failure rate check
+    return np.full(len(df), p.failure_rate)
 
 
-def get_error_code_for_pattern(pattern_name, txn):
-    """Get error code for a pattern-matched failure"""
-    pattern = config.PATTERNS[pattern_name]
+def pattern_error_codes(df, pattern_name):
+    """Error codes for a batch of pattern-matched failures"""
+    p = PATTERN_CACHE[pattern_name]
     
     # Handle canary_spike phases
     if pattern_name == "canary_spike":
-        hour = txn["timestamp"].hour
-        phase1 = pattern["phase_1"]
-        phase2 = pattern["phase_2"]
-        
-        if hour == phase1["start_hour"]:
-            return phase1["error_code"]
-        else:
-            return phase2["error_code"]
-    
-    # Check if we should inject diversity (noise)
-    if random.random() < pattern.get("error_diversity", 0):
-        # Return random error code for noise
-        return random.choice(config.ALL_ERROR_CODES)
-    
-    # Return primary error code for this pattern
-    return pattern["error_code"]
-
-
-def generate_base_transaction(index, forced_attributes=None):
-    """Generate a single base transaction with random or forced attributes"""
-    timestamp = generate_timestamp(index, config.TOTAL_TRANSACTIONS)
-    
-    # Determine if international transaction
-    is_international = random.random() < config.INTERNATIONAL_RATE
-    currency = "INR"
-    original_amount = generate_amount()
-    
-    if is_international:
-        # Select currency based on weights
-        currency = random.choices(
-            config.INTERNATIONAL_CURRENCIES,
-            weights=config.INTERNATIONAL_CURRENCY_WEIGHTS,
-            k=1
-        )[0]
-        # Convert amount to foreign currency (rough approximation)
-        if currency == "USD":
-            original_amount = round(original_amount * 0.012, 2)
-        elif currency == "EUR":
-            original_amount = round(original_amount * 0.011, 2)
-        elif currency == "GBP":
-            original_amount = round(original_amount * 0.0095, 2)
-        elif currency == "AED":
-            original_amount = round(original_amount * 0.044, 2)
-        elif currency == "SGD":
-            original_amount = round(original_amount * 0.016, 2)
-        elif currency == "AUD":
-            original_amount = round(original_amount * 0.019, 2)
-    
-    txn = {
-        "transaction_id": generate_transaction_id(index),
-        "timestamp": timestamp,
-        "bank": random.choice(config.BANKS),
-        "card_type": random.choice(config.CARD_TYPES),
-        "merchant_category": random.choice(config.MERCHANT_CATEGORIES),
-        "customer_tier": random.choice(config.CUSTOMER_TIERS),
-        "amount": original_amount,
+        hour = df["timestamp"].dt.hour.to_numpy()
+        return np.where(
+            hour == p.phase1.start_hour,
+            p.phase1.error_code,
+            p.phase2.error_code
+        )
+    
+    # Inject diversity (noise): some failures get a random error code
+    n = len(df)
+    is_noise = _RNG.random(n) < p.error_diversity
+    noise_codes = _RNG.choice(_ERROR_CODES_ARR, size=n)
+    return np.where(is_noise, noise_codes, p.error_code)
+
+
+def random_categorical(categories, n):
+    """Draw n uniform values as a Categorical over the predeclared categories"""
+    codes = _RNG.integers(0, len(categories), size=n)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+# Rough INR -> foreign currency conversion rates, indexed by currency id;
+# INR is appended last with a rate of 1.0 for domestic transactions
+FX_RATES_FROM_INR = {"USD": 0.012, "EUR": 0.011, "GBP": 0.0095, "AED": 0.044, "SGD": 0.016, "AUD": 0.019}
+_CURRENCY_CODES = np.asarray(config.INTERNATIONAL_CURRENCIES + ["INR"])
+_FX_RATES = np.asarray([FX_RATES_FROM_INR[c] for c in config.INTERNATIONAL_CURRENCIES] + [1.0])
+_INR_ID = len(config.INTERNATIONAL_CURRENCIES)
+
+
+_START_US = np.datetime64(config.START_TIME, "us")
+_WINDOW_US = config.DURATION_HOURS * 3600 * 10**6
+
+
+def generate_base_transactions(n):
+    """Generate n base transactions as a single columnar batch"""
+    index = np.arange(n)
+    
+    # Evenly distributed timestamps over the time window (exact integer microseconds)
+    offsets_us = index * _WINDOW_US // config.TOTAL_TRANSACTIONS
+    timestamps = _START_US + offsets_us.astype("timedelta64[us]")
+    
+    # International transactions get a weighted currency and a converted amount
+    amounts = generate_amounts(n)
+    is_international = _RNG.random(n) < config.INTERNATIONAL_RATE
+    currency_ids = _RNG.choice(
+        len(config.INTERNATIONAL_CURRENCIES),
+        size=n,
+        p=config.INTERNATIONAL_CURRENCY_WEIGHTS
+    )
+    currency_ids = np.where(is_international, currency_ids, _INR_ID)
+    currency = _CURRENCY_CODES[currency_ids]
+    amounts = np.round(amounts * _FX_RATES[currency_ids], 2)
+    
+    return pd.DataFrame({
+        "transaction_id": generate_transaction_ids(index),
+        "timestamp": timestamps,
+        "bank": random_categorical(config.BANKS, n),
+        "card_type": random_categorical(config.CARD_TYPES, n),
+        "merchant_category": random_categorical(config.MERCHANT_CATEGORIES, n),
+        "customer_tier": random_categorical(config.CUSTOMER_TIERS, n),
+        "amount": amounts,
         "currency": currency,
         "is_international": is_international,
         "status": "SUCCESS",  # Default, will be overridden if fails
-        "latency_ms": generate_latency(),
+        "latency_ms": generate_latencies(n),
         "error_code": None
-    }
-    
-    # Override with forced attributes if provided
-    if forced_attributes:
-        txn.update(forced_attributes)
-    
-    return txn
+    })
 
 
-def inject_pattern_failures(transactions):
-    """Inject intelligence trap patterns into transactions"""
+def inject_failures(df):
+    """Inject pattern and random noise failures in a single pass over column arrays"""
     pattern_stats = {name: {"matched": 0, "failed": 0} for name in config.PATTERNS.keys()}
     
-    for txn in transactions:
-        # Check each pattern in priority order
-        for pattern_name in ["whale_trap", "margin_destroyer", "canary_spike", "weekend_vip"]:
-            if matches_pattern(txn, pattern_name):
-                pattern_stats[pattern_name]["matched"] += 1
-                
-                # Determine if this should fail
-                if should_fail_for_pattern(txn, pattern_name):
-                    pattern_stats[pattern_name]["failed"] += 1
-                    txn["status"] = "FAILED"
-                    txn["error_code"] = get_error_code_for_pattern(pattern_name, txn)
-                    
-                    # Apply latency multiplier
-                    multiplier = config.PATTERNS[pattern_name].get("latency_multiplier", 1.0)
-                    txn["latency_ms"] = generate_latency(is_failing=True, multiplier=multiplier)
-                
-                # Only match first pattern (no overlapping patterns)
-                break
-    
-    return pattern_stats
-
-
-def inject_random_failures(transactions):
-    """Add random noise failures (70% of total failures should be random)"""
-    random_failures = 0
-    
-    for txn in transactions:
-        # Skip if already failed due to pattern
-        if txn["status"] == "FAILED":
+    n = len(df)
+    failed = df["status"].eq("FAILED").to_numpy(copy=True)
+    error_codes = df["error_code"].to_numpy(dtype=object, copy=True)
+    latencies = df["latency_ms"].to_numpy(copy=True)
+    
+    # Prefilled uniform draws: one for the pattern failure check, one for noise
+    pattern_draw = _RNG.random(n)
+    noise_draw = _RNG.random(n)
+    
+    unmatched = np.ones(n, dtype=bool)
+    for pattern_name in PATTERN_PRIORITY:
+        # Only match first pattern (no overlapping patterns)
+        matched = pattern_mask(df, pattern_name).to_numpy() & unmatched
+        unmatched &= ~matched
+        
+        # Determine which matched transactions should fail
+        hit = matched & (pattern_draw < pattern_failure_rates(df, pattern_name))
+        hit_count = int(hit.sum())
+        
+        pattern_stats[pattern_name]["matched"] = int(matched.sum())
+        pattern_stats[pattern_name]["failed"] = hit_count
+        
+        if hit_count == 0:
             continue
         
-        # Apply baseline failure rate to non-pattern transactions
-        if random.random() > config.BASE_SUCCESS_RATE:
-            txn["status"] = "FAILED"
-            txn["error_code"] = random.choice(config.ALL_ERROR_CODES)
-            txn["latency_ms"] = generate_latency(is_failing=True, multiplier=1.5)
-            random_failures += 1
+        failed |= hit
+        error_codes[hit] = pattern_error_codes(df[hit], pattern_name)
+        
+        # Apply latency multiplier
+        multiplier = PATTERN_CACHE[pattern_name].latency_multiplier
+        latencies[hit] = generate_latencies(hit_count, multiplier=multiplier)
+    
+    # Random noise: baseline failure rate over everything a pattern did not fail
+    noise = ~failed & (noise_draw > config.BASE_SUCCESS_RATE)
+    random_failures = int(noise.sum())
+    error_codes[noise] = _RNG.choice(_ERROR_CODES_ARR, size=random_failures)
+    latencies[noise] = generate_latencies(random_failures, multiplier=1.5)
+    failed |= noise
     
-    return random_failures
+    # Single write-back of the three mutated columns
+    df["status"] = np.where(failed, "FAILED", "SUCCESS")
+    df["error_code"] = error_codes
+    df["latency_ms"] = latencies
+    
+    return pattern_stats, random_failures
 
 
-def calculate_statistics(transactions):
+def calculate_statistics(df):
     """Calculate and display generation statistics"""
-    df = pd.DataFrame(transactions)
-    
     total = len(df)
-    successes = len(df[df["status"] == "SUCCESS"])
-    failures = len(df[df["status"] == "FAILED"])
+    status_counts = df["status"].value_counts()
+    successes = int(status_counts.get("SUCCESS", 0))
+    failures = int(status_counts.get("FAILED", 0))
     success_rate = successes / total
     
+    # Single aggregation pass over the numeric columns
+    summary = df.agg({"amount": ["min", "max", "mean"], "latency_ms": "mean"})
+    
     print(f"\n{'='*60}")
     print(f"CHAOS ENGINE - DATA GENERATION COMPLETE")
     print(f"{'='*60}")
     print(f"Total Transactions: {total}")
     print(f"Successes: {successes} ({success_rate:.1%})")
     print(f"Failures: {failures} ({1-success_rate:.1%})")
-    print(f"\nAmount Range: ₹{df['amount'].min():.2f} - ₹{df['amount'].max():.2f}")
-    print(f"Average Amount: ₹{df['amount'].mean():.2f}")
-    print(f"Average Latency: {df['latency_ms'].mean():.0f}ms")
+    print(f"\nAmount Range: ₹{summary.at['min', 'amount']:.2f} - ₹{summary.at['max', 'amount']:.2f}")
+    print(f"Average Amount: ₹{summary.at['mean', 'amount']:.2f}")
+    print(f"Average Latency: {summary.at['mean', 'latency_ms']:.0f}ms")
     
     return {
         "total_transactions": total,
@@ -336,48 +356,42 @@ def save_ground_truth(pattern_stats, overall_stats):
     print(f"\nGround truth saved to: {config.GROUND_TRUTH}")
 
 
-def force_inject_pattern_transactions(transactions):
+def forced_timestamps(hours, minutes):
+    """Timestamps on the generation day at the given hours and minutes"""
+    offsets = pd.to_timedelta(hours * 60 + minutes, unit="min")
+    return pd.Timestamp(config.START_TIME.replace(hour=0, minute=0)) + offsets
+
+
+def regenerate_transactions(df, rows, forced_segments):
+    """Replace rows with one fresh batch, forcing attributes per contiguous segment"""
+    fresh = generate_base_transactions(len(rows))
+    
+    # Row identity (ID and slot timestamp) is kept unless a segment forces a timestamp
+    fresh = fresh.drop(columns=["transaction_id"])
+    fresh["timestamp"] = df["timestamp"].to_numpy()[rows]
+    
+    start = 0
+    for count, forced_attributes in forced_segments:
+        segment = slice(start, start + count)
+        for column, values in forced_attributes.items():
+            fresh.iloc[segment, fresh.columns.get_loc(column)] = values
+        start += count
+    fresh.index = df.index[rows]
+    
+    df.loc[fresh.index, fresh.columns] = fresh
+
+
+def force_inject_pattern_transactions(df):
     """Force-inject transactions matching pattern criteria to guarantee volumes"""
     print("\nForce-injecting pattern transactions to guarantee volumes...")
     
-    injection_count = 0
-    available_indices = list(range(len(transactions)))
-    random.shuffle(available_indices)
-    
     # Pattern 1: Whale Trap - HDFC Rewards >₹5K at 14:00-16:00
     whale_target = config.PATTERNS["whale_trap"]["target_volume"]
     print(f"  Injecting {whale_target} whale_trap transactions...")
-    for i in range(whale_target):
-        if not available_indices:
-            break
-        idx = available_indices.pop()
-        
-        # Create timestamp in 14:00-16:00 window
-        hour = random.choice([14, 15])
-        minute = random.randint(0, 59)
-        timestamp = config.START_TIME.replace(hour=hour, minute=minute)
-        
-        transactions[idx] = generate_base_transaction(idx, forced_attributes={
-            "timestamp": timestamp,
-            "bank": "HDFC",
-            "card_type": "Rewards",
-            "amount": round(random.uniform(5500, 12000), 2)  # Ensure >5K
-        })
-        injection_count += 1
     
     # Pattern 2: Margin Destroyer - SBI <₹100
     margin_target = config.PATTERNS["margin_destroyer"]["target_volume"]
     print(f"  Injecting {margin_target} margin_destroyer transactions...")
-    for i in range(margin_target):
-        if not available_indices:
-            break
-        idx = available_indices.pop()
-        
-        transactions[idx] = generate_base_transaction(idx, forced_attributes={
-            "bank": "SBI",
-            "amount": round(random.uniform(10, 99), 2)  # Ensure <100
-        })
-        injection_count += 1
     
     # Pattern 3: Canary Spike - ICICI Debit at 18:00-19:00
     canary_target = config.PATTERNS["canary_spike"]["target_volume"]
@@ -387,41 +401,39 @@ def force_inject_pattern_transactions(transactions):
     phase1_count = canary_target // 3  # 1/3 in phase 1
     phase2_count = canary_target - phase1_count  # 2/3 in phase 2
     
-    # Phase 1 transactions
-    for i in range(phase1_count):
-        if not available_indices:
-            break
-        idx = available_indices.pop()
-        
-        minute = random.randint(0, 29)  # 18:00-18:29
-        timestamp = config.START_TIME.replace(hour=18, minute=minute)
-        
-        transactions[idx] = generate_base_transaction(idx, forced_attributes={
-            "timestamp": timestamp,
+    # Pattern 4: Weekend VIP - Already has 200 matches, skip forcing (it's over-represented naturally)
+    # Just let random generation handle this one
+    
+    # Every phase writes a disjoint slice of one random row sample, so all of
+    # them are regenerated and written back in a single batch
+    forced_segments = [
+        (whale_target, {
+            "timestamp": forced_timestamps(_RNG.choice([14, 15], size=whale_target), _RNG.integers(0, 60, size=whale_target)),
+            "bank": "HDFC",
+            "card_type": "Rewards",
+            "amount": np.round(_RNG.uniform(5500, 12000, size=whale_target), 2)  # Ensure >5K
+        }),
+        (margin_target, {
+            "bank": "SBI",
+            "amount": np.round(_RNG.uniform(10, 99, size=margin_target), 2)  # Ensure <100
+        }),
+        # Phase 1 transactions: 18:00-18:29
+        (phase1_count, {
+            "timestamp": forced_timestamps(np.full(phase1_count, 18), _RNG.integers(0, 30, size=phase1_count)),
             "bank": "ICICI",
             "card_type": "Debit"
-        })
-        injection_count += 1
-    
-    # Phase 2 transactions
-    for i in range(phase2_count):
-        if not available_indices:
-            break
-        idx = available_indices.pop()
-        
-        hour = 19
-        minute = random.randint(0, 59)
-        timestamp = config.START_TIME.replace(hour=hour, minute=minute)
-        
-        transactions[idx] = generate_base_transaction(idx, forced_attributes={
-            "timestamp": timestamp,
+        }),
+        # Phase 2 transactions: 19:00-19:59
+        (phase2_count, {
+            "timestamp": forced_timestamps(np.full(phase2_count, 19), _RNG.integers(0, 60, size=phase2_count)),
             "bank": "ICICI",
             "card_type": "Debit"
         })
-        injection_count += 1
+    ]
     
-    # Pattern 4: Weekend VIP - Already has 200 matches, skip forcing (it's over-represented naturally)
-    # Just let random generation handle this one
+    injection_count = whale_target + margin_target + phase1_count + phase2_count
+    rows = _RNG.permutation(len(df))[:injection_count]
+    regenerate_transactions(df, rows, forced_segments)
     
     print(f"  Total forced injections: {injection_count}")
     return injection_count
@@ -434,44 +446,51 @@ def main():
     
     # Generate base transactions
     print("Step 1: Generating base transactions...")
-    transactions = [generate_base_transaction(i) for i in range(config.TOTAL_TRANSACTIONS)]
+    df = generate_base_transactions(config.TOTAL_TRANSACTIONS)
     
     # Force-inject pattern transactions
     print("Step 2: Force-injecting pattern transactions...")
-    force_inject_pattern_transactions(transactions)
+    force_inject_pattern_transactions(df)
     
-    # Inject pattern failures
-    print("\nStep 3: Applying failure logic to patterns...")
-    pattern_stats = inject_pattern_failures(transactions)
+    # Inject pattern and random noise failures
+    print("\nStep 3: Applying failure logic to patterns and random noise...")
+    pattern_stats, random_failures = inject_failures(df)
     
     # Print pattern injection results
     print("\nPattern Injection Results:")
     for pattern_name, stats in pattern_stats.items():
         print(f"  {pattern_name:20s}: {stats['matched']:3d} matched, {stats['failed']:3d} failed")
     
-    # Inject random failures
-    print("\nStep 4: Adding random noise failures...")
-    random_failures = inject_random_failures(transactions)
-    print(f"  Random failures added: {random_failures}")
+    print(f"\nStep 4: Random noise failures added: {random_failures}")
     
     # Calculate statistics
-    overall_stats = calculate_statistics(transactions)
+    overall_stats = calculate_statistics(df)
     
     # Save to CSV
     print(f"\nStep 5: Saving data...")
-    df = pd.DataFrame(transactions)
     
     # Ensure directory exists
     os.makedirs(config.DATA_DIR, exist_ok=True)
     
-    # Save CSV
-    df.to_csv(config.OUTPUT_CSV, index=False)
+    # Convert to Arrow once; the CSV and Parquet writers share the same table
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    
+    # Save CSV (Arrow's multithreaded C++ writer)
+    pacsv.write_csv(table, config.OUTPUT_CSV)
     print(f"  CSV saved to: {config.OUTPUT_CSV}")
     
-    # Save JSON
-    df.to_json(config.OUTPUT_JSON, orient='records', date_format='iso', indent=2)
+    # Save JSON (orjson; timestamps pre-formatted as ISO with millisecond precision)
+    records = df.assign(
+        timestamp=df["timestamp"].dt.strftime("%Y-%m-%dT%H:%M:%S.%f").str[:-3]
+    ).to_dict(orient='records')
+    with open(config.OUTPUT_JSON, 'wb') as f:
+        f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     print(f"  JSON saved to: {config.OUTPUT_JSON}")
     
+    # Save Parquet (typed, columnar; categoricals keep their dictionary encoding)
+    pq.write_table(table, config.OUTPUT_PARQUET, compression='zstd')
+    print(f"  Parquet saved to: {config.OUTPUT_PARQUET}")
+    
     # Save ground truth
     save_ground_truth(pattern_stats, overall_stats)
     
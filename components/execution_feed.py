@@ -2,7 +2,39 @@
 Execution Feed Component - Terminal-style live execution log
 """
 import streamlit as st
-from datetime import datetime
+import pandas as pd
+from itertools import chain
+
+# Status -> (icon, css class) and action -> (icon, css class) lookups
+_STATUS_MAP = {
+    "SUCCESS": ("✓", "log-success"),
+    "FAILED": ("✗", "log-error"),
+}
+_STATUS_DEFAULT = ("⏳", "log-info")
+
+_ACTION_MAP = {
+    "REROUTE": ("🔄", "log-success"),
+    "ALERT": ("📧", "log-warning"),
+    "IGNORE": ("⛔", "log-info"),
+}
+_ACTION_DEFAULT = ("•", "log-info")
+
+
+def _log_entry(exec_item: dict, time_str: str):
+    """Terminal lines for a single execution"""
+    action = exec_item.get("action_taken", "UNKNOWN")
+    target = exec_item.get("target", "N/A")
+    cost = exec_item.get("cost_incurred", 0)
+    volume = exec_item.get("transactions_affected", 0)
+    status_icon, status_class = _STATUS_MAP.get(exec_item.get("status", "PENDING"), _STATUS_DEFAULT)
+    action_icon, action_color = _ACTION_MAP.get(action, _ACTION_DEFAULT)
+    
+    return (
+        f'<span class="{status_class}">[{time_str}] {status_icon} {action} executed</span>',
+        f'<span class="{action_color}">    {action_icon} Target: {target}</span>',
+        f'<span class="log-info">    📊 Volume: {volume} txn | Cost: ₹{cost:.2f}</span>',
+        '',  # Empty line for spacing
+    )
 
 
 def render(executions: list):
@@ -12,56 +44,22 @@ def render(executions: list):
         st.info("ℹ️ No executions yet. Run executor_agent.py to see live actions.")
         return
     
-    # Build terminal-style log
-    log_lines = []
+    frame = pd.DataFrame(executions).reindex(
+        columns=["execution_timestamp", "status", "cost_incurred"]
+    )
     
-    for exec_item in executions:
-        timestamp = exec_item.get("execution_timestamp", "")
-        action = exec_item.get("action_taken", "UNKNOWN")
-        target = exec_item.get("target", "N/A")
-        status = exec_item.get("status", "PENDING")
-        cost = exec_item.get("cost_incurred", 0)
-        volume = exec_item.get("transactions_affected", 0)
-        
-        # Parse timestamp for display
-        try:
-            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            time_str = dt.strftime("%H:%M:%S")
-        except:
-            time_str = "00:00:00"
-        
-        # Color based on status and action
-        if status == "SUCCESS":
-            status_icon = "✓"
-            status_class = "log-success"
-        elif status == "FAILED":
-            status_icon = "✗"
-            status_class = "log-error"
-        else:
-            status_icon = "⏳"
-            status_class = "log-info"
-        
-        # Action-specific formatting
-        if action == "REROUTE":
-            action_icon = "🔄"
-            action_color = "log-success"
-        elif action == "ALERT":
-            action_icon = "📧"
-            action_color = "log-warning"
-        elif action == "IGNORE":
-            action_icon = "⛔"
-            action_color = "log-info"
-        else:
-            action_icon = "•"
-            action_color = "log-info"
-        
-        # Build log entry
-        log_lines.append(f'<span class="{status_class}">[{time_str}] {status_icon} {action} executed</span>')
-        log_lines.append(f'<span class="{action_color}">    {action_icon} Target: {target}</span>')
-        log_lines.append(f'<span class="log-info">    📊 Volume: {volume} txn | Cost: ₹{cost:.2f}</span>')
-        log_lines.append('')  # Empty line for spacing
+    # Parse all timestamps for display in one vectorized pass
+    times = (
+        pd.to_datetime(frame["execution_timestamp"], utc=True, errors="coerce", format="ISO8601")
+        .dt.strftime("%H:%M:%S")
+        .fillna("00:00:00")
+        .tolist()
+    )
     
-    log_html = '<br/>'.join(log_lines)
+    # Build terminal-style log
+    log_html = '<br/>'.join(chain.from_iterable(
+        _log_entry(exec_item, time_str) for exec_item, time_str in zip(executions, times)
+    ))
     
     # Render terminal
     terminal_html = f"""
@@ -73,9 +71,10 @@ def render(executions: list):
     st.markdown(terminal_html, unsafe_allow_html=True)
     
     # Summary stats
-    total_executed = len([e for e in executions if e.get("status") == "SUCCESS"])
-    total_failed = len([e for e in executions if e.get("status") == "FAILED"])
-    total_cost = sum([e.get("cost_incurred", 0) for e in executions])
+    status_counts = frame["status"].value_counts()
+    total_executed = int(status_counts.get("SUCCESS", 0))
+    total_failed = int(status_counts.get("FAILED", 0))
+    total_cost = frame["cost_incurred"].fillna(0).sum()
     
     col1, col2, col3 = st.columns(3)
     col1.metric("✓ Successful", total_executed)
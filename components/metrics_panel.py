@@ -1,22 +1,26 @@
 """
 components/metrics_panel.py
-Right-sidebar metrics panel: donut chart, cost/revenue bar, waterfall, system status.
+Horizontal metrics panel: KPI row, decision donut, financial waterfall, system status.
 """
 import streamlit as st
+from utils.formatting import inr, models_label
 import plotly.graph_objects as go
 
+# Vertical gap above the chart row, emitted with each column's first markdown call
+_SPACER = '<div style="height:1rem;"></div>'
 
-def _donut_chart(metrics: dict):
-    """Decision type distribution donut."""
+
+def _plot(fig: go.Figure):
+    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+
+
+@st.cache_data(show_spinner=False)
+def _donut_figure(reroutes: int, ignored: int, alerts: int, total: int) -> go.Figure:
+    """Decision type distribution donut, cached per metric values."""
     labels  = ["REROUTE", "IGNORE", "ALERT"]
-    values  = [
-        metrics.get("reroutes_executed", 4),
-        metrics.get("reroutes_ignored", 3),  # stored as ignored count
-        metrics.get("alerts_raised", 2),
-    ]
+    values  = [reroutes, ignored, alerts]
     # Remaining = OTHER
     total_known = sum(values)
-    total = metrics.get("patterns_discovered", 10)
     other = max(0, total - total_known)
     if other > 0:
         labels.append("OTHER")
@@ -58,15 +62,22 @@ def _donut_chart(metrics: dict):
             itemdoubleclick=False,
         ),
     )
-    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+    return fig
 
 
-def _waterfall_chart(metrics: dict):
-    """Financial waterfall: Baseline → Cost → Revenue → Net Profit."""
-    cost  = metrics.get("total_cost", 615.0)
-    rev   = metrics.get("total_revenue_saved", 12038.45)
-    net   = metrics.get("net_profit", 11422.73)
+def _donut_chart(metrics: dict):
+    """Decision type distribution donut."""
+    _plot(_donut_figure(
+        metrics.get("reroutes_executed", 4),
+        metrics.get("reroutes_ignored", 3),  # stored as ignored count
+        metrics.get("alerts_raised", 2),
+        metrics.get("patterns_discovered", 10),
+    ))
 
+
+@st.cache_data(show_spinner=False)
+def _waterfall_figure(cost: float, rev: float, net: float) -> go.Figure:
+    """Financial waterfall: Baseline → Cost → Revenue → Net Profit."""
     labels  = ["Baseline", "Costs", "Revenue\nSaved", "Net Profit"]
     values  = [0, -cost, rev, net]
     # measure: relative for middle, total for ends
@@ -80,7 +91,7 @@ def _waterfall_chart(metrics: dict):
         decreasing=dict(marker=dict(color="#ef5350")),
         totals=dict(marker=dict(color="#00d4ff")),
         connector=dict(line=dict(color="#1e4976", width=1, dash="dot")),
-        text=[f"₹0", f"-₹{cost:,.0f}", f"+₹{rev:,.0f}", f"₹{net:,.0f}"],
+        text=["₹0", f"-₹{inr(cost)}", f"+₹{inr(rev)}", f"₹{inr(net)}"],
         textposition="outside",
         textfont=dict(size=9, color="#e2e8f0", family="Rajdhani, sans-serif"),
         hoverinfo="skip",
@@ -98,18 +109,19 @@ def _waterfall_chart(metrics: dict):
         yaxis=dict(showgrid=False, showline=False, showticklabels=False),
         showlegend=False,
     )
-    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+    return fig
 
 
-def _system_status(metadata: dict, metrics: dict):
-    """System health widget."""
-    inf_time  = metadata.get("inference_time_seconds", 4.88)
-    accuracy  = metrics.get("decision_accuracy", 0.85)
-    model     = metadata.get("model_used", "llama-3.3-70b-versatile")
-    fail_rate = metrics.get("total_failures", 459) / max(metrics.get("total_transactions", 2500), 1)
+def _waterfall_chart(cost: float, rev: float, net: float):
+    """Financial waterfall chart."""
+    _plot(_waterfall_figure(cost, rev, net))
+
 
+@st.cache_data(show_spinner=False)
+def _system_status_html(model: str, inf_time: float, accuracy: float, fail_rate: float) -> str:
+    """System health widget HTML, cached per displayed values."""
     rows = [
-        ("LLM Backend",    model.split("-")[-1] if "-" in model else model, "sys-ok"),
+        ("LLM Backend",    model, "sys-ok"),
         ("Inference",      f"{inf_time}s avg", "sys-ok"),
         ("Decision Acc.",  f"{accuracy*100:.0f}%", "sys-ok"),
         ("Failure Rate",   f"{fail_rate*100:.1f}%", "sys-warn"),
@@ -117,16 +129,26 @@ def _system_status(metadata: dict, metrics: dict):
         ("Alert Channel",  "Email + Slack", "sys-ok"),
     ]
 
-    html = '<div class="metrics-card"><div class="metrics-card-title">⚙️ System Status</div>'
+    parts = ['<div class="metrics-card"><div class="metrics-card-title">⚙️ System Status</div>']
     for label, val, cls in rows:
-        html += (
+        parts.append(
             f'<div class="sys-status-row">'
             f'  <span class="sys-label">{label}</span>'
             f'  <span class="sys-val {cls}">{val}</span>'
             f'</div>'
         )
-    html += '</div>'
-    st.markdown(html, unsafe_allow_html=True)
+    parts.append('</div>')
+    return "".join(parts)
+
+
+def _system_status(metadata: dict, metrics: dict, accuracy: float):
+    """System health widget."""
+    inf_time  = metadata.get("inference_time_seconds", 4.88)
+    model     = models_label(metadata)
+    total     = metrics.get("total_transactions") or 2500
+    fail_rate = metrics.get("total_failures", 459) / total
+
+    st.markdown(_SPACER + _system_status_html(model, inf_time, accuracy, fail_rate), unsafe_allow_html=True)
 
 
 def render(metrics: dict, metadata: dict | None = None):
@@ -134,6 +156,12 @@ def render(metrics: dict, metadata: dict | None = None):
     if metadata is None:
         metadata = {}
 
+    # Shared metric values, fetched once for the KPI row and the charts
+    cost     = metrics.get("total_cost", 615.0)
+    rev      = metrics.get("total_revenue_saved", 12038.45)
+    net      = metrics.get("net_profit", 11422.73)
+    accuracy = metrics.get("decision_accuracy", 0.85)
+
     # Section title
     st.markdown(
         '<div class="section-title"><span class="title-icon">📊</span> Key Performance Metrics</div>',
@@ -144,11 +172,9 @@ def render(metrics: dict, metadata: dict | None = None):
     col1, col2, col3, col4 = st.columns(4, gap="medium")
     
     with col1:
-        cost = metrics.get("total_cost", 615.0)
-        st.metric("💰 Total Cost", f"₹{cost:,.0f}", delta=None, delta_color="inverse")
+        st.metric("💰 Total Cost", f"₹{inr(cost)}", delta=None, delta_color="inverse")
     
     with col2:
-        rev = metrics.get("total_revenue_saved", 12038.45)
         st.metric("💵 Revenue Saved", f"₹{rev:,.2f}", delta=None)
     
     with col3:
@@ -156,27 +182,24 @@ def render(metrics: dict, metadata: dict | None = None):
         st.metric("📈 Return Multiple", f"{eff:.1f}×", delta=None)
     
     with col4:
-        accuracy = metrics.get("decision_accuracy", 0.85)
         st.metric("🎯 Decision Accuracy", f"{accuracy*100:.0f}%", delta=None)
 
-    st.markdown('<div style="height:1rem;"></div>', unsafe_allow_html=True)
-
     # Create 3-column layout for charts and system status
     chart_col1, chart_col2, chart_col3 = st.columns([1, 1, 1], gap="medium")
     
     with chart_col1:
         st.markdown(
-            '<div class="metrics-card"><div class="metrics-card-title">📊 Decision Distribution</div></div>',
+            _SPACER + '<div class="metrics-card"><div class="metrics-card-title">📊 Decision Distribution</div></div>',
             unsafe_allow_html=True,
         )
         _donut_chart(metrics)
     
     with chart_col2:
         st.markdown(
-            '<div class="metrics-card"><div class="metrics-card-title">💵 Financial Waterfall</div></div>',
+            _SPACER + '<div class="metrics-card"><div class="metrics-card-title">💵 Financial Waterfall</div></div>',
             unsafe_allow_html=True,
         )
-        _waterfall_chart(metrics)
+        _waterfall_chart(cost, rev, net)
     
     with chart_col3:
-        _system_status(metadata, metrics)
+        _system_status(metadata, metrics, accuracy)
@@ -2,18 +2,35 @@
 components/routing_flow.py
 Renders the Live Transaction Routing Flow as a Plotly Sankey diagram.
 """
+import numpy as np
 import streamlit as st
+from utils.formatting import inr
 import plotly.graph_objects as go
 
+# Link hover labels, bound once as str.format methods
+_SRC_LABEL = (
+    "<b>{fg} → SENTINEL</b><br>"
+    "Volume: {vol} txn<br>"
+    "Failure rate: ~95%+<br>"
+    "Revenue at risk: ₹{risk}+"
+).format
+_TGT_LABEL = (
+    "<b>SENTINEL → {tg}</b><br>"
+    "Volume: {vol} txn<br>"
+    "Success rate: {sr:.0%}<br>"
+    "Revenue saved: ₹{rev}<br>"
+    "Cost: ₹{cost} | <b>Net: +₹{net}</b>"
+).format
 
-def render(reroute_sessions: list):
-    st.markdown(
-        '<div class="section-title"><span class="title-icon">🔄</span> Live Transaction Routing Flow</div>',
-        unsafe_allow_html=True,
-    )
 
+_TITLE_HTML = '<div class="section-title"><span class="title-icon">🔄</span> Live Transaction Routing Flow</div>'
+
+
+def render(reroute_sessions: list):
+    # Empty state: title and message go out in a single markdown call
     if not reroute_sessions:
         st.markdown(
+            _TITLE_HTML +
             '<div style="color:#546e7a; font-size:0.8rem; padding:1.5rem; text-align:center; '
             'background:rgba(0,0,0,0.2); border-radius:8px; border:1px dashed #1e4976;">'
             'No reroutes executed this run. Patterns detected but actions were IGNORE / ALERT — '
@@ -22,23 +39,22 @@ def render(reroute_sessions: list):
         )
         return
 
+    st.markdown(_TITLE_HTML, unsafe_allow_html=True)
+
     # ── Build Sankey node/link data ──
     # Nodes: [SOURCE gateways] → [SENTINEL] → [TARGET gateways]
     # We dedupe source & target names and place SENTINEL in the middle.
 
-    sources_set = []
-    targets_set = []
+    # Insertion-ordered name -> position maps give dedup and index lookup in one
+    sources_idx = {}
+    targets_idx = {}
     for s in reroute_sessions:
-        fg = s["from_gateway"]
-        tg = s["to_gateway"]
-        if fg not in sources_set:
-            sources_set.append(fg)
-        if tg not in targets_set:
-            targets_set.append(tg)
+        sources_idx.setdefault(s["from_gateway"], len(sources_idx))
+        targets_idx.setdefault(s["to_gateway"], len(targets_idx))
 
     # Node order: sources | SENTINEL | targets
-    sentinel_idx = len(sources_set)
-    node_labels  = sources_set + ["SENTINEL\n🧠 AI Engine"] + targets_set
+    sentinel_idx = len(sources_idx)
+    node_labels  = list(sources_idx) + ["SENTINEL\n🧠 AI Engine"] + list(targets_idx)
 
     # Colour palette
     source_colors = {
@@ -64,14 +80,15 @@ def render(reroute_sessions: list):
         else:
             node_colors.append(target_colors.get(n, "rgba(76,175,80,0.7)"))
 
-    # Links: source → SENTINEL, then SENTINEL → target
-    link_sources = []
-    link_targets = []
-    link_values  = []
-    link_labels  = []
-    link_colors  = []
+    # Links: source → SENTINEL, then SENTINEL → target (two per session, preallocated)
+    n_links      = 2 * len(reroute_sessions)
+    link_sources = np.empty(n_links, dtype=np.int32)
+    link_targets = np.empty(n_links, dtype=np.int32)
+    link_values  = np.empty(n_links, dtype=np.int64)
+    link_labels  = [""] * n_links
+    link_colors  = [""] * n_links
 
-    for s in reroute_sessions:
+    for k, s in zip(range(0, n_links, 2), reroute_sessions):
         fg    = s["from_gateway"]
         tg    = s["to_gateway"]
         vol   = s["volume"]
@@ -79,33 +96,22 @@ def render(reroute_sessions: list):
         cost  = s["cost"]
         rev   = s["revenue_saved"]
         net   = rev - cost
-        s_idx = sources_set.index(fg)
-        t_idx = sentinel_idx + 1 + targets_set.index(tg)
+        s_idx = sources_idx[fg]
+        t_idx = sentinel_idx + 1 + targets_idx[tg]
 
         # source → SENTINEL
-        link_sources.append(s_idx)
-        link_targets.append(sentinel_idx)
-        link_values.append(vol)
-        link_labels.append(
-            f"<b>{fg} → SENTINEL</b><br>"
-            f"Volume: {vol} txn<br>"
-            f"Failure rate: ~95%+<br>"
-            f"Revenue at risk: ₹{vol * (rev / vol * 50):.0f}+"
-        )
-        link_colors.append("rgba(239,83,80,0.35)")
+        link_sources[k] = s_idx
+        link_targets[k] = sentinel_idx
+        link_values[k]  = vol
+        link_labels[k]  = _SRC_LABEL(fg=fg, vol=vol, risk=inr(rev * 50))
+        link_colors[k]  = "rgba(239,83,80,0.35)"
 
         # SENTINEL → target
-        link_sources.append(sentinel_idx)
-        link_targets.append(t_idx)
-        link_values.append(vol)
-        link_labels.append(
-            f"<b>SENTINEL → {tg}</b><br>"
-            f"Volume: {vol} txn<br>"
-            f"Success rate: {sr*100:.0f}%<br>"
-            f"Revenue saved: ₹{rev:,.0f}<br>"
-            f"Cost: ₹{cost:,.0f} | <b>Net: +₹{net:,.0f}</b>"
-        )
-        link_colors.append("rgba(76,175,80,0.35)")
+        link_sources[k + 1] = sentinel_idx
+        link_targets[k + 1] = t_idx
+        link_values[k + 1]  = vol
+        link_labels[k + 1]  = _TGT_LABEL(tg=tg, vol=vol, sr=sr, rev=inr(rev), cost=inr(cost), net=inr(net))
+        link_colors[k + 1]  = "rgba(76,175,80,0.35)"
 
     fig = go.Figure(data=[go.Sankey(
         arrangement="snap",
@@ -128,10 +134,6 @@ def render(reroute_sessions: list):
     )])
 
     fig.update_layout(
-        sankey=dict(
-            hoverlink=True,
-            hovernode=True,
-        ),
         height=280,
         margin=dict(l=12, r=12, t=8, b=8),
         font=dict(
@@ -146,15 +148,15 @@ def render(reroute_sessions: list):
     st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
 
     # ── Summary pills below the diagram ──
-    pills_html = '<div style="display:flex; gap:0.55rem; flex-wrap:wrap; margin-top:0.15rem;">'
+    parts = ['<div style="display:flex; gap:0.55rem; flex-wrap:wrap; margin-top:0.15rem;">']
     for s in reroute_sessions:
         net = s["revenue_saved"] - s["cost"]
-        pills_html += (
+        parts.append(
             f'<div style="background:rgba(76,175,80,0.1); border:1px solid rgba(76,175,80,0.25); '
             f'border-radius:6px; padding:0.28rem 0.6rem; font-size:0.68rem; color:#a5d6a7; '
             f'font-family:Rajdhani,sans-serif; font-weight:600;">'
-            f'✓ {s["from_gateway"]} → {s["to_gateway"]}  |  {s["volume"]} txn  |  +₹{net:,.0f}'
+            f'✓ {s["from_gateway"]} → {s["to_gateway"]}  |  {s["volume"]} txn  |  +₹{inr(net)}'
             f'</div>'
         )
-    pills_html += '</div>'
-    st.markdown(pills_html, unsafe_allow_html=True)
+    parts.append('</div>')
+    st.markdown("".join(parts), unsafe_allow_html=True)
@@ -3,7 +3,13 @@ SENTINEL Configuration
 Single source of truth for all constants, business rules, and system parameters.
 """
 
+import math
+import os
+import sys
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from enum import IntFlag
+from typing import Final
 
 # ============================================================================
 # BUSINESS CONSTANTS
@@ -31,6 +37,31 @@ TRANSACTION_FLOW_PATH = "data/transaction_flow.json"
 ALERT_LOG_PATH = "data/alerts.log"
 SIMULATION_MODE = True                  # Set False for production execution
 
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Immutable snapshot of the business rules read on hot decision paths."""
+    REROUTE_COST: float
+    MARGIN_RATE: float
+    VIP_THRESHOLD: int
+    MIN_PATTERN_SIZE: int
+    SPIKE_MULTIPLIER: float
+    CONFIDENCE_THRESHOLD: float
+    MAX_REROUTES_PER_HOUR: int
+    MIN_NET_BENEFIT_THRESHOLD: float
+
+
+SETTINGS = Settings(
+    REROUTE_COST=REROUTE_COST,
+    MARGIN_RATE=MARGIN_RATE,
+    VIP_THRESHOLD=VIP_THRESHOLD,
+    MIN_PATTERN_SIZE=MIN_PATTERN_SIZE,
+    SPIKE_MULTIPLIER=SPIKE_MULTIPLIER,
+    CONFIDENCE_THRESHOLD=CONFIDENCE_THRESHOLD,
+    MAX_REROUTES_PER_HOUR=MAX_REROUTES_PER_HOUR,
+    MIN_NET_BENEFIT_THRESHOLD=MIN_NET_BENEFIT_THRESHOLD,
+)
+
 # ============================================================================
 # DATA GENERATION SETTINGS
 # ============================================================================
@@ -47,11 +78,12 @@ INTERNATIONAL_RATE = 0.15               # 15% of transactions are international
 INTERNATIONAL_CURRENCIES = ["USD", "EUR", "GBP", "AED", "SGD", "AUD"]
 INTERNATIONAL_CURRENCY_WEIGHTS = [0.35, 0.25, 0.15, 0.10, 0.10, 0.05]  # USD most common
 
-# Transaction Dimensions
-BANKS = ["HDFC", "SBI", "ICICI", "Axis", "Kotak"]
-CARD_TYPES = ["Debit", "Credit", "Rewards", "Corporate"]
-MERCHANT_CATEGORIES = ["E-commerce", "Travel", "Food", "Utilities"]
-CUSTOMER_TIERS = ["VIP", "Regular", "New"]
+# Transaction Dimensions (immutable; frozenset siblings for membership checks)
+BANKS = ("HDFC", "SBI", "ICICI", "Axis", "Kotak")
+CARD_TYPES = ("Debit", "Credit", "Rewards", "Corporate")
+MERCHANT_CATEGORIES = ("E-commerce", "Travel", "Food", "Utilities")
+CUSTOMER_TIERS = ("VIP", "Regular", "New")
+BANKS_SET = frozenset(BANKS)
 
 # Amount Distribution (Lognormal - realistic payment distribution)
 AMOUNT_MIN = 10
@@ -92,8 +124,8 @@ ERROR_CODES = {
     ]
 }
 
-# Flatten for random selection
-ALL_ERROR_CODES = [code for codes in ERROR_CODES.values() for code in codes]
+# Flatten once for random selection
+ALL_ERROR_CODES = tuple(code for codes in ERROR_CODES.values() for code in codes)
 
 # ============================================================================
 # INTELLIGENCE TRAP PATTERNS (The 4 Patterns to Inject)
@@ -177,10 +209,15 @@ PATTERNS = {
 # ============================================================================
 
 LLM_MODEL = "llama-3.3-70b-versatile"          # Gemini 1.5 Flash (fallback with separate quota)
+LLM_MODEL_FAST = "llama-3.1-8b-instant" # Clear-cut clusters (large |net benefit|, no infra errors)
+FAST_TIER_MIN_NET_BENEFIT = 1500        # |Net_Benefit| (₹) above which a cluster is clear-cut
 LLM_TEMPERATURE = 0.1                   # Low temperature for deterministic reasoning
 MAX_OUTPUT_TOKENS = 2000                # Maximum tokens for LLM response
 LLM_TIMEOUT_SECONDS = 30
 MAX_RETRIES = 2
+LLM_ATTEMPT_BUDGETS_SECONDS = (15.0, 8.0, 4.0)  # Wall-clock cap per council attempt (shrinks on retry)
+LLM_MAX_CONCURRENT = 4                  # Max in-flight LLM requests per process
+LLM_SHARD_SIZE = 4                      # Clusters per LLM request; shards run concurrently
 
 # ============================================================================
 # EMAIL ALERT SETTINGS
@@ -212,15 +249,16 @@ DATA_DIR = "data"
 LOGS_DIR = "logs"
 
 # Output Files
-OUTPUT_CSV = f"{DATA_DIR}/transactions.csv"
-OUTPUT_JSON = f"{DATA_DIR}/transactions.json"
-GROUND_TRUTH = f"{DATA_DIR}/ground_truth.json"
+OUTPUT_CSV = os.path.join(DATA_DIR, "transactions.csv")
+OUTPUT_JSON = os.path.join(DATA_DIR, "transactions.json")
+OUTPUT_PARQUET = os.path.join(DATA_DIR, "transactions.parquet")
+GROUND_TRUTH = os.path.join(DATA_DIR, "ground_truth.json")
 
 # Execution Logs
-EXECUTION_LOG = f"{LOGS_DIR}/execution_log.json"
-EMAIL_LOG = f"{LOGS_DIR}/email_log.json"
-DECISION_DB = f"{LOGS_DIR}/decisions.json"
-ROUTING_CONFIG = f"{LOGS_DIR}/routing_config.json"
+EXECUTION_LOG = os.path.join(LOGS_DIR, "execution_log.json")
+EMAIL_LOG = os.path.join(LOGS_DIR, "email_log.json")
+DECISION_DB = os.path.join(LOGS_DIR, "decisions.json")
+ROUTING_CONFIG = os.path.join(LOGS_DIR, "routing_config.json")
 
 # ============================================================================
 # DASHBOARD SETTINGS
@@ -229,34 +267,48 @@ ROUTING_CONFIG = f"{LOGS_DIR}/routing_config.json"
 DASHBOARD_TITLE = "SENTINEL - Pattern-Aware Payment Remediation"
 DASHBOARD_SUBTITLE = "The AI That Knows When NOT To Fix Things"
 
-# Refresh rate for live demo (seconds)
-DASHBOARD_REFRESH_RATE = 2
+# Per-widget refresh intervals (seconds); widgets sharing a tick batch their reads
+DASHBOARD_REFRESH_INTERVALS = {"success": 2, "reroute": 4, "profit": 10}
 
-# Chart colors
-COLOR_SUCCESS = "#28a745"
-COLOR_FAILURE = "#dc3545"
-COLOR_REROUTE = "#007bff"
-COLOR_IGNORE = "#6c757d"
-COLOR_ALERT = "#ffc107"
+# Base polling tick for live demo (seconds): every widget interval is a multiple of it
+DASHBOARD_REFRESH_RATE = math.gcd(*DASHBOARD_REFRESH_INTERVALS.values())
+
+# Chart colors (interned so dict lookups keyed on them hit the identity fast path)
+COLOR_SUCCESS = sys.intern("#28a745")
+COLOR_FAILURE = sys.intern("#dc3545")
+COLOR_REROUTE = sys.intern("#007bff")
+COLOR_IGNORE = sys.intern("#6c757d")
+COLOR_ALERT = sys.intern("#ffc107")
 
 # ============================================================================
 # VALIDATION RULES
 # ============================================================================
 
 # Data Quality Checks
-MIN_PATTERN_INSTANCES = 15              # Each pattern should have at least 15 instances
-MAX_PATTERN_CORRELATION = 0.95          # Patterns shouldn't be 100% deterministic
-BASELINE_TOLERANCE = 0.03               # 92% ±3% success rate acceptable
-REQUIRE_TIMESTAMP_SPREAD = True         # Timestamps should be evenly distributed
+MIN_PATTERN_INSTANCES: Final[int] = 15        # Each pattern should have at least 15 instances
+MAX_PATTERN_CORRELATION: Final[float] = 0.95  # Patterns shouldn't be 100% deterministic
+BASELINE_TOLERANCE: Final[float] = 0.03       # 92% ±3% success rate acceptable
 
 # ============================================================================
 # DEMO OPTIMIZATION
 # ============================================================================
 
-# Story arc settings
-FRONT_LOAD_PATTERNS = False             # Don't make patterns obvious in first 100 transactions
-DRAMATIC_TIMING = True                  # Space pattern discoveries for better narrative
-INCLUDE_FALSE_ALARM = True              # Include one unprofitable pattern to test IGNORE logic
+class DemoFlags(IntFlag):
+    """Story-arc and validation switches, checked with a single bitwise AND."""
+    FRONT_LOAD = 1      # Make patterns obvious in first 100 transactions
+    DRAMATIC = 2        # Space pattern discoveries for better narrative
+    FALSE_ALARM = 4     # Include one unprofitable pattern to test IGNORE logic
+    TS_SPREAD = 8       # Require timestamps to be evenly distributed
+    REROUTE_ALL = 16    # Baseline ("dumb" system) reroutes everything
+
+
+# Story arc settings (FRONT_LOAD off: don't make patterns obvious early)
+DEMO_FLAGS = (
+    DemoFlags.DRAMATIC
+    | DemoFlags.FALSE_ALARM
+    | DemoFlags.TS_SPREAD
+    | DemoFlags.REROUTE_ALL
+)
 
 # Playback speed for simulated real-time
 PLAYBACK_SPEED_MULTIPLIER = 10          # Process 10 transactions per second in demo
@@ -273,8 +325,14 @@ ENV_ALERT_EMAIL_TO = "ALERT_EMAIL_TO"   # Override default ops email
 # BASELINE COMPARISON (For Demo Metrics)
 # ============================================================================
 
-# What a "dumb" system would do (reroute everything)
-BASELINE_REROUTE_ALL = True
+# Plain Python numbers on purpose: NumPy/pandas convert a scalar operand once
+# per vectorized op, so typed (np.int32) copies would buy nothing.
+
+# What a "dumb" system would do (reroute everything: DemoFlags.REROUTE_ALL)
 BASELINE_EXPECTED_LOSS = -2250          # Expected net loss from baseline approach
 SENTINEL_TARGET_PROFIT = 800            # Our target net profit
-IMPROVEMENT_TARGET_PERCENT = 300        # 300% improvement over baseline
+
+# % improvement of target over baseline, derived so the three cannot drift apart
+IMPROVEMENT_TARGET_PERCENT = round(
+    100 * (SENTINEL_TARGET_PROFIT - BASELINE_EXPECTED_LOSS) / abs(BASELINE_EXPECTED_LOSS)
+)
@@ -9,15 +9,27 @@ Architecture: Single LLM call with three embedded perspectives:
 """
 
 import os
+import re
 import json
 import time
+import random
+import hashlib
+import sqlite3
+import socket
+import heapq
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
 
+import httpx
+import orjson
 import pandas as pd
 from dotenv import load_dotenv
-from groq import Groq
+from pydantic import TypeAdapter, ValidationError
+from groq import Groq, RateLimitError, APIConnectionError, InternalServerError
 
 from models import Transaction, FailureCluster, AgentDecision, PerformanceMetrics
 from config import (
@@ -26,7 +38,14 @@ from config import (
     MIN_PATTERN_SIZE,
     SPIKE_MULTIPLIER,
     LLM_MODEL,
+    LLM_MODEL_FAST,
+    FAST_TIER_MIN_NET_BENEFIT,
+    ERROR_CODES,
     LLM_TEMPERATURE,
+    LLM_TIMEOUT_SECONDS,
+    LLM_ATTEMPT_BUDGETS_SECONDS,
+    LLM_MAX_CONCURRENT,
+    LLM_SHARD_SIZE,
     MAX_OUTPUT_TOKENS
 )
 
@@ -37,17 +56,67 @@ load_dotenv()
 api_key = os.getenv("GROQ_API_KEY")
 if not api_key:
     raise ValueError("Missing API key. Set GROQ_API_KEY in .env file")
-client = Groq(api_key=api_key)
+# One pooled, keep-alive HTTP client shared by every CouncilAgent. SDK retries are
+# off: _analyze_batch is the only retry layer (see RETRYABLE_LLM_ERRORS)
+client = Groq(
+    api_key=api_key,
+    max_retries=0,
+    http_client=httpx.Client(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=2.0),
+    ),
+)
+
+# Error codes that point at provider infrastructure (possible spike → needs the main model)
+INFRA_ERROR_CODES = frozenset(ERROR_CODES["infrastructure"])
+
+# Transient failures worth another attempt (APITimeoutError is an APIConnectionError;
+# httpx.TimeoutException is a stream stalling mid-response, which the SDK's Stream
+# iterator does not wrap; TimeoutError is our own per-attempt deadline). Anything
+# else fails the batch at once.
+RETRYABLE_LLM_ERRORS = (
+    RateLimitError, APIConnectionError, InternalServerError, httpx.TimeoutException, TimeoutError
+)
+
+# Admission control: at most LLM_MAX_CONCURRENT requests in flight per process
+LLM_ADMISSION = threading.BoundedSemaphore(LLM_MAX_CONCURRENT)
+
+# Markdown code fence around an LLM response (body up to the first closing fence)
+MARKDOWN_FENCE = re.compile(r'^```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+
+# Validates a whole LLM response in one call
+DECISION_LIST_ADAPTER = TypeAdapter(List[AgentDecision])
+
+# Validates a sample of loaded transactions in one call
+TRANSACTION_LIST_ADAPTER = TypeAdapter(List[Transaction])
+TRANSACTION_SAMPLE_SIZE = 100
+
+# Transaction columns stored as pandas categoricals after loading
+CATEGORICAL_COLUMNS = ['bank', 'card_type', 'merchant_category', 'customer_tier', 'error_code', 'status']
+
+# Columns of the failures frame that _create_clusters reads
+CLUSTER_COLUMNS = ['bank', 'card_type', 'amount_bucket', 'amount', 'hour', 'error_code']
+
+# Amount buckets for clustering: [edge_i, edge_i+1) → label_i
+AMOUNT_BUCKET_EDGES = [-float("inf"), 100, 1000, 5000, float("inf")]
+AMOUNT_BUCKET_LABELS = ["<100", "100-1000", "1000-5000", ">5000"]
 
 # Pattern history tracking
 PATTERN_HISTORY_PATH = "data/pattern_history.json"
 
+# Local cache of per-cluster LLM decisions, keyed by prompt digest + cluster signature
+LLM_CACHE_PATH = "data/llm_cache.sqlite"
+LLM_CACHE_TTL_SECONDS = 3600
+
 
 class CouncilAgent:
     """
     The Strategist - Multi-persona LLM for pattern detection and decision recommendation
     """
     
+    # Built system prompts, keyed by include_extended_examples (shared across instances)
+    _SYSTEM_PROMPTS: Dict[bool, str] = {}
+    
     def __init__(self, model_name: str = LLM_MODEL):
         """Initialize Council Agent with Groq Llama model"""
         self.model_name = model_name
@@ -56,6 +125,14 @@ class CouncilAgent:
         self.metrics: Optional[PerformanceMetrics] = None
         self.pattern_history = self._load_pattern_history()
         self.calibrations: List[Dict[str, Any]] = []
+        self._system_prompt = self._get_system_prompt(self._needs_extended_examples())
+        self._prompt_digest = hashlib.sha256(
+            f"{self.model_name}\n{LLM_MODEL_FAST}\n{self._system_prompt}".encode("utf-8")
+        ).hexdigest()[:16]
+        self.llm_cache_hits = 0
+        self.llm_cache_misses = 0
+        self.decisions_received = 0
+        self.model_shards: Dict[str, int] = {}  # LLM requests (shards) sent per model this run
         
     def analyze_failures(self, transactions_path: str = "data/transactions.json") -> Dict[str, Any]:
         """
@@ -104,7 +181,8 @@ class CouncilAgent:
                 ),
                 "metadata": {
                     "timestamp": datetime.now().isoformat(),
-                    "model_used": LLM_MODEL,
+                    "model_used": "none",
+                    "models_used": {},
                     "inference_time_seconds": round(time.time() - start_time, 2),
                     "total_decisions": 0
                 }
@@ -117,8 +195,9 @@ class CouncilAgent:
         calibrations = self._calibrate_confidence(top_clusters)
         print(f"   ✓ Calibrated {len(calibrations)} patterns")
         
-        print(f"\n🧠 Analyzing patterns with {LLM_MODEL}...")
+        print(f"\n🧠 Analyzing patterns with {self.model_name} / {LLM_MODEL_FAST}...")
         decisions = self._analyze_with_llm(top_clusters, calibrations)
+        self.decisions_received = len(decisions)
         print(f"   ✓ LLM call completed ({time.time() - start_time:.1f}s)")
         print(f"   ✓ Received {len(decisions)} decisions")
         
@@ -139,31 +218,83 @@ class CouncilAgent:
         return output
     
     def _load_transactions(self, path: str) -> pd.DataFrame:
-        """Load and validate transaction data"""
+        """
+        Load and validate transaction data.
+        
+        Accepts a .parquet file directly (validated and typed like JSON input).
+        For JSON input, a sibling .council.parquet copy is written on first load
+        and preferred while it is newer than the JSON.
+        """
         if not os.path.exists(path):
             raise FileNotFoundError(
                 f"Transactions file not found: {path}\n"
                 f"Run chaos_engine.py first to generate synthetic data."
             )
         
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if path.endswith('.parquet'):
+            df = pd.read_parquet(path)
+            # External parquet (e.g. chaos_engine's export) gets the same sample
+            # validation and dtypes as JSON input
+            sample = df.head(TRANSACTION_SAMPLE_SIZE).to_json(orient='records', date_format='iso')
+            TRANSACTION_LIST_ADAPTER.validate_python(orjson.loads(sample))
+            df[CATEGORICAL_COLUMNS] = df[CATEGORICAL_COLUMNS].astype('category')
+        else:
+            df = self._read_transactions_cached(path)
+        
+        # Derived clustering columns, computed once so failures and segment totals share them
+        df['hour'] = df['timestamp'].dt.hour.astype('int8')
+        df['amount_bucket'] = pd.cut(
+            df['amount'], bins=AMOUNT_BUCKET_EDGES, labels=AMOUNT_BUCKET_LABELS, right=False
+        )
+        
+        return df
+    
+    def _read_transactions_cached(self, path: str) -> pd.DataFrame:
+        """
+        Read JSON transactions through the council's own sibling .council.parquet
+        copy when it is at least as new as the JSON; otherwise (or if the copy is
+        unreadable) parse the JSON and refresh the copy. The copy is named apart
+        from chaos_engine's transactions.parquet export so the two never mix.
+        """
+        parquet_path = os.path.splitext(path)[0] + '.council.parquet'
+        if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(path):
+            try:
+                return pd.read_parquet(parquet_path)
+            except (OSError, ImportError, ValueError) as e:
+                print(f"   ⚠️  Ignoring unreadable parquet cache ({e}); re-reading JSON")
+        
+        df = self._read_transactions_json(path)
+        try:
+            df.to_parquet(parquet_path, index=False)
+        except (OSError, ImportError, ValueError) as e:
+            print(f"   ⚠️  Could not cache transactions as parquet: {e}")
+        return df
+    
+    def _read_transactions_json(self, path: str) -> pd.DataFrame:
+        """Parse the chaos_engine JSON export into a typed DataFrame"""
+        with open(path, 'rb') as f:
+            data = orjson.loads(f.read())
+        
+        # Validate schema on a sample (one pydantic-core call, not per-row models)
+        TRANSACTION_LIST_ADAPTER.validate_python(data[:TRANSACTION_SAMPLE_SIZE])
         
         # Convert to DataFrame
         df = pd.DataFrame(data)
         
-        # Parse timestamps
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        # Parse timestamps (all ISO 8601 from chaos_engine; skips per-row format inference)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601', cache=True)
         
-        # Validate schema (sample first few rows)
-        for row in data[:5]:
-            Transaction(**row)  # Pydantic validation
+        # Low-cardinality dimensions as categoricals: cheaper groupby keys and comparisons
+        df[CATEGORICAL_COLUMNS] = df[CATEGORICAL_COLUMNS].astype('category')
         
         return df
     
     def _filter_failures(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Extract failed transactions only"""
-        return df[df['status'] == 'FAILED'].copy()
+        """
+        Extract failed transactions, keeping only the columns clustering reads
+        (read-only downstream, so no defensive copy)
+        """
+        return df.loc[df['status'] == 'FAILED', CLUSTER_COLUMNS]
     
     def _create_clusters(self, failures: pd.DataFrame, all_df: pd.DataFrame) -> List[FailureCluster]:
         """
@@ -173,77 +304,62 @@ class CouncilAgent:
         - Primary: (bank, card_type)
         - Secondary: amount_range, time_window, merchant_category, customer_tier
         """
-        clusters = []
-        
-        # Add hour column for temporal grouping
-        failures['hour'] = failures['timestamp'].dt.hour  # type: ignore
-        
-        # Define amount buckets
-        def get_amount_bucket(amount):
-            if amount < 100:
-                return "<100"
-            elif amount < 1000:
-                return "100-1000"
-            elif amount < 5000:
-                return "1000-5000"
-            else:
-                return ">5000"
-        
-        failures['amount_bucket'] = failures['amount'].apply(get_amount_bucket)
-        
         # Group by multiple dimensions
         grouping_keys = ['bank', 'card_type', 'amount_bucket']
         
-        # Sort to ensure deterministic ordering
-        for group_key, group_df in failures.groupby(grouping_keys, sort=True):
-            if len(group_df) < MIN_PATTERN_SIZE:
-                continue  # Skip small clusters
-            
-            bank, card_type, amount_range = group_key
-            
-            # Calculate failure rate for this segment
-            segment_total = len(all_df[
-                (all_df['bank'] == bank) & 
-                (all_df['card_type'] == card_type) &
-                (all_df['amount'].apply(get_amount_bucket) == amount_range)
-            ])
-            
-            failure_rate = len(group_df) / segment_total if segment_total > 0 else 0
-            
-            # Time window (most common hours)
-            hour_counts = group_df['hour'].value_counts()
-            if len(hour_counts) > 0:
-                dominant_hours = hour_counts.head(2).index.tolist()
-                time_window = f"{min(dominant_hours):02d}:00-{max(dominant_hours)+1:02d}:00"
-            else:
-                time_window = "all_day"
-            
-            # Error codes (top 3)
-            error_codes = group_df['error_code'].value_counts().head(3).index.tolist()
-            
-            # Create cluster
-            cluster = FailureCluster(
+        # Per-segment summaries in one groupby each; only observed combinations
+        summary = failures.groupby(grouping_keys, observed=True, sort=False).agg(
+            count=('amount', 'size'),
+            avg_amount=('amount', 'mean'),
+        )
+        summary = summary[summary['count'] >= MIN_PATTERN_SIZE]  # Skip small clusters
+        
+        # Segment sizes across all transactions → failure rate
+        segment_totals = all_df.groupby(grouping_keys, observed=True, sort=False).size()
+        summary['failure_rate'] = summary['count'] / segment_totals.reindex(summary.index)
+        
+        # Time window from the two most common hours
+        hours = self._top_values_per_group(failures, grouping_keys, 'hour', 2)
+        hour_span = hours.groupby(level=grouping_keys, observed=True).agg(['min', 'max'])
+        summary = summary.join(hour_span)
+        
+        # Error codes (top 3)
+        errors = self._top_values_per_group(failures, grouping_keys, 'error_code', 3)
+        summary['error_codes'] = errors.astype(object).groupby(level=grouping_keys, observed=True, sort=False).agg(list)
+        
+        return [
+            FailureCluster(
                 bank=bank,
                 card_type=card_type,
                 amount_range=amount_range,
-                count=len(group_df),
-                avg_amount=float(group_df['amount'].mean()),
-                failure_rate=failure_rate,
-                time_window=time_window,
-                error_codes=error_codes
+                count=int(row.count),
+                avg_amount=float(row.avg_amount),
+                failure_rate=float(row.failure_rate),
+                time_window=f"{int(row.min):02d}:00-{int(row.max) + 1:02d}:00",
+                error_codes=row.error_codes
             )
-            
-            clusters.append(cluster)
-        
-        return clusters
+            for (bank, card_type, amount_range), row in zip(summary.index, summary.itertuples(index=False))
+        ]
+    
+    @staticmethod
+    def _top_values_per_group(df: pd.DataFrame, keys: List[str], column: str, n: int) -> pd.Series:
+        """
+        The n most frequent values of `column` within each group, as a Series
+        indexed by the group keys. Ties keep first-seen order (like value_counts).
+        """
+        counts = df.groupby(keys + [column], observed=True, sort=False).size()
+        top = counts.sort_values(ascending=False, kind='stable').groupby(level=keys, observed=True, sort=False).head(n)
+        return top.reset_index(level=column)[column]
     
     def _rank_clusters(self, clusters: List[FailureCluster], max_clusters: int = 12) -> List[FailureCluster]:
         """
         Rank clusters by business impact (count × avg_amount)
         Keep top N for LLM analysis
         """
-        # Calculate impact score with stable secondary keys for deterministic ordering
-        ranked = sorted(
+        # Calculate impact score with stable secondary keys for deterministic ordering;
+        # heap selection keeps only the top N instead of sorting every cluster
+        return heapq.nsmallest(
+            max_clusters,
             clusters,
             key=lambda c: (
                 -(c.count * c.avg_amount),  # Primary: impact (descending)
@@ -252,18 +368,29 @@ class CouncilAgent:
                 c.amount_range               # Quaternary: alphabetical
             )
         )
-        
-        return ranked[:max_clusters]
     
-    def _build_system_prompt(self, confidence_briefing: Optional[str] = None) -> str:
+    @classmethod
+    def _get_system_prompt(cls, include_extended_examples: bool = False) -> str:
+        """Return the system prompt, building it at most once per variant"""
+        prompt = cls._SYSTEM_PROMPTS.get(include_extended_examples)
+        if prompt is None:
+            prompt = cls._build_system_prompt(include_extended_examples)
+            cls._SYSTEM_PROMPTS[include_extended_examples] = prompt
+        return prompt
+    
+    @classmethod
+    def _build_system_prompt(cls, include_extended_examples: bool = False) -> str:
         """
-        Construct the multi-persona system prompt
+        Construct the multi-persona system prompt.
+        
+        Kept free of per-run values so every request shares a byte-identical
+        prefix that Groq's prompt cache can reuse; calibration context goes in
+        the user message instead. Only pattern type A is included by default;
+        types B-E are added when the previous run looked unreliable.
         """
-        confidence_context = ""
-        if confidence_briefing:
-            confidence_context = f"\n\n## CONFIDENCE CALIBRATION BRIEFING\n\n{confidence_briefing}\n\nThis briefing reflects the system's historical performance on similar patterns. Factor this into your confidence scoring."
+        extended_examples = cls._extended_examples() if include_extended_examples else ""
         
-        return f"""You are the SENTINEL Council - a payment operations decision system with two expert advisors and one moderator.{confidence_context}
+        return f"""You are the SENTINEL Council - a payment operations decision system with two expert advisors and one moderator.
 
 ## COUNCIL STRUCTURE
 
@@ -447,13 +574,50 @@ Characteristics: High net benefit + Critical customer impact + Stable
 }}
 ```
 
-### Pattern Type B: Unanimous IGNORE
+{extended_examples}## TEMPORAL SIGNAL DEFINITIONS
+
+**stable**: Failure rate consistent for 1+ hours
+- Example: "HDFC 98% failure for 2 hours"
+- Indicates: Systemic provider issue, rerouting likely succeeds
+
+**spike_detected**: Failure rate increased 3x in <30 minutes
+- Example: "ICICI 5%→18% in 10 minutes"
+- Indicates: Infrastructure degradation, impending total outage
+
+**declining**: Failure rate decreasing over time
+- Example: "Failure rate 80%→60%→40% over 1 hour"
+- Indicates: Self-healing, transient issue resolving
+
+## CUSTOMER IMPACT LEVELS
+
+**CRITICAL**: VIP tier (>₹3K avg) OR failure rate >80% OR time-sensitive (Travel, E-commerce)
+**HIGH**: Regular customers with 50-80% failure rate
+**MODERATE**: Regular customers with 20-50% failure rate
+**LOW**: Micro-transactions (<₹200) OR <20% failure rate
+
+## YOUR RESPONSIBILITIES
+
+As the council system, you must:
+
+1. **Generate all three perspectives** for each pattern (CFO analysis, CTO analysis, Moderator synthesis)
+2. **Show your work** - include all calculations in CFO analysis
+3. **Apply tiebreaker rules consistently** when CFO and CTO disagree
+4. **Label agreement clearly** - state if unanimous or which side moderator chose
+5. **Ensure alignment** - final_action must match the logic presented
+6. **Adjust confidence** based on agreement strength
+
+Now analyze these failure clusters and return your council's structured decisions."""
+
+    @staticmethod
+    def _extended_examples() -> str:
+        """Few-shot examples for pattern types B-E (IGNORE, CTO override, tiebreak, system-wide ALERT)"""
+        return """### Pattern Type B: Unanimous IGNORE
 Characteristics: Negative net benefit + Low customer impact
 
 **Input**: SBI <₹100, 127 txn, avg ₹42, 76% failure, stable
 **Output**:
 ```json
-{{
+{
   "pattern_detected": "SBI micro-transactions <₹100",
   "affected_volume": 127,
   "avg_amount": 42.0,
@@ -463,7 +627,7 @@ Characteristics: Negative net benefit + Low customer impact
   "decision": "IGNORE",
   "reasoning": "CFO perspective: Severe negative ROI—we'd pay ₹15 to save ₹0.85 per transaction, creating ₹14.15 loss per transaction. Total net loss of ₹1,797 is financially indefensible. CTO perspective: Micro-transaction segment has high customer retry tolerance. Users successfully switch to alternate payment methods within minutes. Platform SLA impact minimal (<2% of total volume). Moderator synthesis: Perfect alignment between financial and operational logic. Both perspectives strongly recommend IGNORE. Resources better deployed on high-value patterns like HDFC Rewards.",
   "confidence": 1.0
-}}
+}
 ```
 
 ### Pattern Type C: CTO Override (Infrastructure Alert)
@@ -472,7 +636,7 @@ Characteristics: Spiking failure rate (infrastructure emergency)
 **Input**: ICICI Debit, 59 txn, failure 5%→18% in 10min
 **Output**:
 ```json
-{{
+{
   "pattern_detected": "ICICI Debit infrastructure spike 5%→18% in 10min",
   "affected_volume": 59,
   "avg_amount": 2200.0,
@@ -482,7 +646,7 @@ Characteristics: Spiking failure rate (infrastructure emergency)
   "decision": "ALERT",
   "reasoning": "CFO perspective: Calculates ₹1,711 net profit opportunity (₹2,596 revenue - ₹885 cost). Appears profitable on paper. CTO perspective: Failure rate tripled in 10 minutes—classic canary warning of infrastructure degradation. Predicts Phase 2 total ICICI outage within 30-60 minutes. Moderator decision: Applying Tiebreaker Rule #1 (Infrastructure Emergency Overrides Profit). Siding with CTO. Spending ₹885 to reroute these 59 transactions would be wasted money when ICICI's backend infrastructure collapses completely. ALERT ops team to prepare system-wide failover instead of treating symptoms with transactional reroutes.",
   "confidence": 0.82
-}}
+}
 ```
 
 ### Pattern Type D: Moderator Tiebreak (VIP Retention)
@@ -491,7 +655,7 @@ Characteristics: Marginal profit + VIP segment
 **Input**: VIP Travel, 22 txn, avg ₹3,500, 65% failure, weekend
 **Output**:
 ```json
-{{
+{
   "pattern_detected": "VIP Travel bookings failing on weekends",
   "affected_volume": 22,
   "avg_amount": 3500.0,
@@ -501,7 +665,7 @@ Characteristics: Marginal profit + VIP segment
   "decision": "REROUTE",
   "reasoning": "CFO perspective: Marginal immediate profit of ₹1,210. Below the ₹1,500 threshold for strong conviction. Notes opportunity cost of deploying ₹330 elsewhere. CTO perspective: VIP customers making time-sensitive Travel purchases. 65% failure rate creates poor user experience. Customer lifetime value (avg ₹15K annually) far exceeds immediate transaction margin. Retention critical for long-term revenue. Moderator decision: Applying Tiebreaker Rule #3 (VIP Retention Breaks Marginal Profit Ties). While immediate ROI is small, losing 22 VIP Travel customers to competitors represents ₹330K annual revenue at risk. Small investment of ₹330 justified for strategic retention value. REROUTE with medium confidence.",
   "confidence": 0.72
-}}
+}
 ```
 
 ### Pattern Type E: Unanimous ALERT (System-Wide Issue)
@@ -510,7 +674,7 @@ Characteristics: All providers affected (platform infrastructure problem)
 **Input**: All banks 2x latency spike, 156 txn affected
 **Output**:
 ```json
-{{
+{
   "pattern_detected": "System-wide latency spike across all providers",
   "affected_volume": 156,
   "avg_amount": 2000.0,
@@ -520,100 +684,157 @@ Characteristics: All providers affected (platform infrastructure problem)
   "decision": "ALERT",
   "reasoning": "CFO perspective: Calculates ₹3,900 net profit on paper (₹6,240 revenue - ₹2,340 cost). However, recognizes that if ALL providers are stressed, backup gateways are equally degraded. Rerouting would waste ₹2,340. CTO perspective: Latency doubled across ALL providers simultaneously. This is not a provider-specific issue—indicates our own platform infrastructure under stress (database connection saturation, load balancer capacity exhaustion). Requires system-level intervention, not transaction-level rerouting. Moderator synthesis: Unanimous ALERT. Both perspectives agree this needs ops team to scale infrastructure, throttle traffic, or implement circuit breaking. Rerouting individual transactions won't solve the underlying platform capacity problem.",
   "confidence": 0.88
-}}
+}
 ```
 
-## TEMPORAL SIGNAL DEFINITIONS
-
-**stable**: Failure rate consistent for 1+ hours
-- Example: "HDFC 98% failure for 2 hours"
-- Indicates: Systemic provider issue, rerouting likely succeeds
-
-**spike_detected**: Failure rate increased 3x in <30 minutes
-- Example: "ICICI 5%→18% in 10 minutes"
-- Indicates: Infrastructure degradation, impending total outage
-
-**declining**: Failure rate decreasing over time
-- Example: "Failure rate 80%→60%→40% over 1 hour"
-- Indicates: Self-healing, transient issue resolving
-
-## CUSTOMER IMPACT LEVELS
-
-**CRITICAL**: VIP tier (>₹3K avg) OR failure rate >80% OR time-sensitive (Travel, E-commerce)
-**HIGH**: Regular customers with 50-80% failure rate
-**MODERATE**: Regular customers with 20-50% failure rate
-**LOW**: Micro-transactions (<₹200) OR <20% failure rate
-
-## YOUR RESPONSIBILITIES
-
-As the council system, you must:
-
-1. **Generate all three perspectives** for each pattern (CFO analysis, CTO analysis, Moderator synthesis)
-2. **Show your work** - include all calculations in CFO analysis
-3. **Apply tiebreaker rules consistently** when CFO and CTO disagree
-4. **Label agreement clearly** - state if unanimous or which side moderator chose
-5. **Ensure alignment** - final_action must match the logic presented
-6. **Adjust confidence** based on agreement strength
-
-Now analyze these failure clusters and return your council's structured decisions."""
-
+"""
+    
+    def _needs_extended_examples(self, path: str = "data/decisions.json") -> bool:
+        """
+        True when the previous run's decisions were weak: mean confidence below
+        0.70 or more than 20% of LLM decisions rejected by validation.
+        """
+        if not os.path.exists(path):
+            return True
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            return True
+        
+        decisions = previous.get("decisions", [])
+        if not decisions:
+            return True
+        
+        mean_confidence = sum(d.get("confidence", 0.0) for d in decisions) / len(decisions)
+        received = previous.get("metadata", {}).get("decisions_received", len(decisions))
+        rejected_share = 1 - len(decisions) / received if received else 0.0
+        
+        return mean_confidence < 0.70 or rejected_share > 0.20
+    
     def _analyze_with_llm(self, clusters: List[FailureCluster], calibrations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Send clusters to LLM for analysis with confidence calibration
+        Send clusters to LLM for analysis with confidence calibration.
+        
+        Decisions are cached per cluster signature and calibration briefing, so
+        only clusters the council hasn't seen recently (or whose briefing has
+        changed) are sent to the model.
         """
-        # Aggregate confidence briefings
-        briefings = [cal.get("council_briefing", "") for cal in calibrations if cal.get("council_briefing")]
-        confidence_briefing = "\n".join([f"• {b}" for b in briefings]) if briefings else None
+        keys = [self._cluster_cache_key(cluster, cal) for cluster, cal in zip(clusters, calibrations)]
+        cached = self._lookup_llm_cache(keys)
+        cached_decisions = []
+        missing = []
+        for cluster, cal, key in zip(clusters, calibrations, keys):
+            decision = cached.get(key)
+            if decision is not None:
+                cached_decisions.append(self._refresh_cached_decision(decision, cluster))
+            else:
+                missing.append((cluster, cal))
+        
+        self.llm_cache_hits = len(cached_decisions)
+        self.llm_cache_misses = len(missing)
+        self.model_shards = {}
+        if cached_decisions:
+            print(f"   ✓ LLM cache: {len(cached_decisions)} hit(s), {len(missing)} cluster(s) to analyze")
+        if not missing:
+            return cached_decisions
+        
+        # Right-size the model: clear-cut clusters go to the fast model, ambiguous
+        # ones to the main model. Each tier is split into shards of LLM_SHARD_SIZE
+        # clusters so no single response nears the output-token limit; all shards
+        # run in parallel.
+        tiers: Dict[str, List[Tuple[FailureCluster, Dict[str, Any]]]] = {}
+        for pair in missing:
+            model = LLM_MODEL_FAST if self._is_clear_cut(pair[0]) else self.model_name
+            tiers.setdefault(model, []).append(pair)
+        
+        shards = []
+        for model, pairs in tiers.items():
+            # Sort before sharding so a cluster lands in the same shard across runs
+            pairs.sort(key=lambda pair: self._cluster_signature(pair[0]))
+            shards.extend((model, pairs[i:i + LLM_SHARD_SIZE]) for i in range(0, len(pairs), LLM_SHARD_SIZE))
+            self.model_shards[model] = -(-len(pairs) // LLM_SHARD_SIZE)
+        
+        with ThreadPoolExecutor(max_workers=min(len(shards), LLM_MAX_CONCURRENT)) as pool:
+            futures = [pool.submit(self._analyze_batch, model, shard) for model, shard in shards]
+        
+        fresh_decisions = []
+        failed = False
+        for (_, shard), future in zip(shards, futures):
+            decisions = future.result()
+            if decisions is None:
+                failed = True
+                continue
+            self._cache_decisions(decisions, shard)
+            fresh_decisions.extend(decisions)
+        
+        if failed:
+            print("   ❌ All retries exhausted. Returning fallback decision.")
+            # Return safe fallback (will fail validation but won't crash)
+            fresh_decisions.append({
+                "pattern_detected": "LLM analysis failed - technical error",
+                "affected_volume": 1,
+                "avg_amount": 0.01,
+                "cost_analysis": "Unable to calculate due to API failure or rate limit exceeded",
+                "temporal_signal": "stable",
+                "risk_category": "payment_failure",
+                "decision": "IGNORE",
+                "reasoning": "Council unable to analyze pattern due to technical error (API failure, rate limit, or network issue). Defaulting to IGNORE to preserve capital and avoid risky decisions without proper analysis.",
+                "confidence": 0.0
+            })
+        
+        return cached_decisions + fresh_decisions
+    
+    @staticmethod
+    def _is_clear_cut(cluster: FailureCluster) -> bool:
+        """Large net benefit/loss and no infrastructure errors: no deep reasoning needed"""
+        net_benefit = cluster.count * (cluster.avg_amount * MARGIN_RATE - REROUTE_COST)
+        return abs(net_benefit) > FAST_TIER_MIN_NET_BENEFIT and INFRA_ERROR_CODES.isdisjoint(cluster.error_codes)
+    
+    def _analyze_batch(
+        self,
+        model: str,
+        batch: List[Tuple[FailureCluster, Dict[str, Any]]]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        One Groq request for a batch of clusters. Returns None if all retries fail.
+        """
+        # Sort by signature so runs differing only in a few clusters share a longer prompt prefix
+        batch = sorted(batch, key=lambda pair: self._cluster_signature(pair[0]))
+        clusters = [cluster for cluster, _ in batch]
         
-        # Build system prompt with calibration context
-        system_prompt = self._build_system_prompt(confidence_briefing)
+        # Aggregate confidence briefings
+        briefings = [cal.get("council_briefing", "") for _, cal in batch if cal.get("council_briefing")]
+        confidence_context = ""
+        if briefings:
+            confidence_briefing = "\n".join([f"• {b}" for b in briefings])
+            confidence_context = f"## CONFIDENCE CALIBRATION BRIEFING\n\n{confidence_briefing}\n\nThis briefing reflects the system's historical performance on similar patterns. Factor this into your confidence scoring.\n\n"
         
-        # Build user message (clusters as JSON)
-        clusters_json = json.dumps([c.model_dump() for c in clusters], indent=2)
+        # Build user message (calibration context + clusters as JSON)
+        clusters_json = "[" + ",\n".join(c.json_str for c in clusters) + "]"
         
-        user_message = f"""Analyze these failure clusters and provide decisions:
+        user_message = f"""{confidence_context}Analyze these failure clusters and provide decisions:
 
 {clusters_json}
 
 Return a JSON array of decisions following the format specified in the system prompt."""
         
-        # Combine into single prompt
-        full_prompt = system_prompt + "\n\n" + user_message
-        
-        # Call Groq with retry logic
-        max_retries = 2
-        for attempt in range(max_retries + 1):
+        # Call Groq with retry logic; each attempt gets a shorter wall-clock budget
+        max_retries = len(LLM_ATTEMPT_BUDGETS_SECONDS) - 1
+        for attempt, budget in enumerate(LLM_ATTEMPT_BUDGETS_SECONDS):
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model_name,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": system_prompt
-                        },
-                        {
-                            "role": "user",
-                            "content": user_message
-                        }
-                    ],
-                    temperature=0,  # Minimizes randomness (but not completely deterministic)
-                    max_tokens=MAX_OUTPUT_TOKENS,
-                    response_format={"type": "json_object"}
-                    # Note: Even with temperature=0, LLM APIs may have slight non-determinism
-                    # due to distributed infrastructure, floating-point ops, and sampling
-                )
+                response_text = self._stream_completion(model, user_message, budget)
                 
                 # Parse JSON response
-                response_text = response.choices[0].message.content
                 if not response_text:
                     raise ValueError("Empty response from LLM")
                 response_text = response_text.strip()
                 
                 # Handle markdown code blocks if present
-                if response_text.startswith("```json"):
-                    response_text = response_text.split("```json")[1].split("```")[0].strip()
-                elif response_text.startswith("```"):
-                    response_text = response_text.split("```")[1].split("```")[0].strip()
+                fence = MARKDOWN_FENCE.match(response_text)
+                if fence:
+                    response_text = fence.group(1)
                 
                 # Parse the JSON response
                 response_data = json.loads(response_text)
@@ -632,29 +853,115 @@ Return a JSON array of decisions following the format specified in the system pr
                 
             except Exception as e:
                 print(f"   ⚠️  Attempt {attempt + 1} failed: {str(e)}")
-                if attempt == max_retries:
-                    print("   ❌ All retries exhausted. Returning fallback decision.")
-                    # Return safe fallback (will fail validation but won't crash)
-                    return [{
-                        "pattern_detected": "LLM analysis failed - technical error",
-                        "affected_volume": 1,
-                        "avg_amount": 0.01,
-                        "cost_analysis": "Unable to calculate due to API failure or rate limit exceeded",
-                        "temporal_signal": "stable",
-                        "risk_category": "payment_failure",
-                        "decision": "IGNORE",
-                        "reasoning": "Council unable to analyze pattern due to technical error (API failure, rate limit, or network issue). Defaulting to IGNORE to preserve capital and avoid risky decisions without proper analysis.",
-                        "confidence": 0.0
-                    }]
-                time.sleep(2)  # Wait before retry
-        
-        # Should never reach here due to return in except block
-        return []
+                if attempt == max_retries or not isinstance(e, RETRYABLE_LLM_ERRORS):
+                    return None
+                # Exponential backoff (capped) with jitter so parallel shards don't retry in lockstep
+                time.sleep(min(0.5 * 2 ** attempt, 8.0) + random.uniform(0, 0.3))
+        
+        return None
+    
+    def _stream_completion(self, model: str, user_message: str, budget: float) -> str:
+        """
+        Stream one completion and return its text, failing fast with TimeoutError
+        if admission or generation exceeds `budget` seconds.
+        """
+        request_start = time.time()
+        deadline = request_start + budget
+        if not LLM_ADMISSION.acquire(timeout=budget):
+            raise TimeoutError(f"no LLM slot free within {budget:.0f}s")
+        
+        try:
+            # Whatever admission left of the budget caps the request itself
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimeoutError(f"{model} budget of {budget:.0f}s spent waiting for a slot")
+            
+            # The client has SDK retries off, so one attempt is one request within budget
+            stream = self.client.chat.completions.create(
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": self._system_prompt
+                    },
+                    {
+                        "role": "user",
+                        "content": user_message
+                    }
+                ],
+                temperature=0,  # Minimizes randomness (but not completely deterministic)
+                max_tokens=MAX_OUTPUT_TOKENS,
+                response_format={"type": "json_object"},
+                stream=True,  # Tokens arrive as generated; read timeout applies per chunk
+                timeout=httpx.Timeout(remaining, connect=min(2.0, remaining))
+                # Note: Even with temperature=0, LLM APIs may have slight non-determinism
+                # due to distributed infrastructure, floating-point ops, and sampling
+            )
+            
+            # Collect streamed tokens. The httpx read timeout restarts with every
+            # chunk, so a slow trickle could outlive the budget; a watchdog aborts
+            # the connection at the deadline, which unblocks any pending read.
+            aborted = threading.Event()
+            watchdog = threading.Timer(max(deadline - time.time(), 0.0), self._abort_stream, (stream, aborted))
+            watchdog.daemon = True
+            watchdog.start()
+            parts = []
+            try:
+                for chunk in stream:
+                    if time.time() > deadline:
+                        raise TimeoutError(f"{model} exceeded {budget:.0f}s budget")
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        if not parts:
+                            print(f"   ✓ {model}: first token after {time.time() - request_start:.1f}s")
+                        parts.append(delta)
+            except Exception as e:
+                if aborted.is_set() and not isinstance(e, TimeoutError):
+                    raise TimeoutError(f"{model} exceeded {budget:.0f}s budget") from e
+                raise
+            finally:
+                watchdog.cancel()
+                stream.close()
+            
+            if aborted.is_set():
+                # The watchdog cut the stream mid-response: the text is truncated
+                raise TimeoutError(f"{model} exceeded {budget:.0f}s budget")
+            return "".join(parts)
+        finally:
+            LLM_ADMISSION.release()
+    
+    @staticmethod
+    def _abort_stream(stream, aborted: threading.Event) -> None:
+        """
+        Abort a streaming response from another thread. Closing the response
+        doesn't interrupt a read blocked on the socket, so shut the socket down
+        (httpcore exposes it as the response's network_stream); the pooled
+        connection is then discarded.
+        """
+        aborted.set()
+        network_stream = stream.response.extensions.get("network_stream")
+        sock = network_stream.get_extra_info("socket") if network_stream is not None else None
+        try:
+            if sock is not None:
+                sock.shutdown(socket.SHUT_RDWR)
+            else:
+                stream.close()
+        except OSError:
+            pass
     
     def _validate_decisions(self, decisions: List[Dict[str, Any]]) -> List[AgentDecision]:
         """
         Validate each decision with Pydantic schema
         """
+        # Fast path: validate the whole list in one call
+        try:
+            return DECISION_LIST_ADAPTER.validate_python(decisions)
+        except ValidationError:
+            pass
+        
+        # Slow path: per item, to report and drop only the invalid decisions
         valid_decisions = []
         
         for i, decision_dict in enumerate(decisions):
@@ -680,28 +987,32 @@ Return a JSON array of decisions following the format specified in the system pr
         Calculate aggregate performance metrics using actual cluster data
         (not LLM-generated values which may be rounded/modified)
         """
-        reroutes = [d for d in decisions if d.decision == "REROUTE"]
-        ignores = [d for d in decisions if d.decision == "IGNORE"]
-        alerts = [d for d in decisions if d.decision == "ALERT"]
-        
-        # Match decisions to original clusters for accurate calculations
-        total_cost = 0.0
-        total_revenue = 0.0
-        
-        for decision in reroutes:
+        # Single pass: tally decision types and total up reroutes, matching each
+        # to its original cluster for accurate calculations
+        decision_counts = {"REROUTE": 0, "IGNORE": 0, "ALERT": 0}
+        rerouted_volume = 0
+        rerouted_amount = 0.0
+        
+        for decision in decisions:
+            decision_counts[decision.decision] = decision_counts.get(decision.decision, 0) + 1
+            if decision.decision != "REROUTE":
+                continue
+            
             # Find matching cluster by pattern similarity
             matched_cluster = self._find_matching_cluster(decision)
             
             if matched_cluster:
                 # Use actual cluster data for calculations
-                cost = matched_cluster.count * REROUTE_COST
-                revenue = matched_cluster.count * matched_cluster.avg_amount * MARGIN_RATE
-                total_cost += cost
-                total_revenue += revenue
+                rerouted_volume += matched_cluster.count
+                rerouted_amount += matched_cluster.count * matched_cluster.avg_amount
             else:
                 # Fallback to LLM values if no cluster match (shouldn't happen)
-                total_cost += decision.affected_volume * REROUTE_COST
-                total_revenue += decision.affected_volume * decision.avg_amount * MARGIN_RATE
+                rerouted_volume += decision.affected_volume
+                rerouted_amount += decision.affected_volume * decision.avg_amount
+        
+        # Apply the per-transaction cost and margin once to the totals
+        total_cost = rerouted_volume * REROUTE_COST
+        total_revenue = rerouted_amount * MARGIN_RATE
         
         net_profit = total_revenue - total_cost
         
@@ -714,9 +1025,9 @@ Return a JSON array of decisions following the format specified in the system pr
         return PerformanceMetrics(
             total_transactions=total_transactions,
             total_failures=total_failures,
-            reroutes_executed=len(reroutes),
-            reroutes_ignored=len(ignores),
-            alerts_raised=len(alerts),
+            reroutes_executed=decision_counts["REROUTE"],
+            reroutes_ignored=decision_counts["IGNORE"],
+            alerts_raised=decision_counts["ALERT"],
             total_cost=total_cost,
             total_revenue_saved=total_revenue,
             net_profit=net_profit,
@@ -732,13 +1043,33 @@ Return a JSON array of decisions following the format specified in the system pr
         if not hasattr(self, 'analyzed_clusters'):
             return None
         
-        pattern_lower = decision.pattern_detected.lower()
+        return self._match_cluster(decision.pattern_detected, self.analyzed_clusters)
+    
+    @staticmethod
+    def _match_cluster(
+        pattern_detected: str,
+        clusters: List[FailureCluster],
+        strict: bool = False
+    ) -> Optional[FailureCluster]:
+        """
+        Return the first cluster whose attributes appear in the pattern text.
+        Default: at least 2 of bank/card_type/amount_range. Strict: all three,
+        with the amount range matched verbatim.
+        """
+        pattern_lower = pattern_detected.lower()
         
-        for cluster in self.analyzed_clusters:
+        for cluster in clusters:
             # Check if cluster attributes appear in pattern description
             bank_match = cluster.bank.lower() in pattern_lower
             card_match = cluster.card_type.lower() in pattern_lower
-            amount_match = cluster.amount_range.lower() in pattern_lower or \
+            exact_amount = cluster.amount_range.lower() in pattern_lower
+            
+            if strict:
+                if bank_match and card_match and exact_amount:
+                    return cluster
+                continue
+            
+            amount_match = exact_amount or \
                           cluster.amount_range.replace('<', '').replace('>', '') in pattern_lower
             
             # Match if at least 2 of 3 key attributes are present
@@ -753,15 +1084,107 @@ Return a JSON array of decisions following the format specified in the system pr
         Path("data").mkdir(exist_ok=True)
         
         if os.path.exists(PATTERN_HISTORY_PATH):
-            with open(PATTERN_HISTORY_PATH, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(PATTERN_HISTORY_PATH, 'rb') as f:
+                return orjson.loads(f.read())
         
         return {}
     
     def _save_pattern_history(self):
         """Persist pattern history to disk"""
-        with open(PATTERN_HISTORY_PATH, 'w', encoding='utf-8') as f:
-            json.dump(self.pattern_history, f, indent=2, ensure_ascii=False)
+        with open(PATTERN_HISTORY_PATH, 'wb') as f:
+            f.write(orjson.dumps(self.pattern_history, option=orjson.OPT_INDENT_2))
+    
+    @staticmethod
+    def _cluster_signature(cluster: FailureCluster) -> str:
+        """Stable identity of a cluster for caching (count bucketed to tens)"""
+        return f"{cluster.bank}|{cluster.card_type}|{cluster.amount_range}|{cluster.time_window}|{cluster.count // 10 * 10}"
+    
+    def _cluster_cache_key(self, cluster: FailureCluster, calibration: Dict[str, Any]) -> str:
+        """
+        Cache key: prompt/model digest + cluster signature + briefing digest.
+        The briefing is the per-cluster calibration the model sees, so a changed
+        briefing must miss the cache rather than reuse an uncalibrated decision.
+        """
+        briefing = calibration.get("council_briefing", "")
+        briefing_digest = hashlib.sha256(briefing.encode("utf-8")).hexdigest()[:12]
+        return f"{self._prompt_digest}:{self._cluster_signature(cluster)}:{briefing_digest}"
+    
+    @staticmethod
+    def _refresh_cached_decision(decision: Dict[str, Any], cluster: FailureCluster) -> Dict[str, Any]:
+        """
+        Re-base a cached decision on the current cluster. The cache key buckets
+        count and ignores avg_amount, so the cached volume, amount and cost
+        analysis may describe an older version of the cluster.
+        """
+        refreshed = dict(decision)
+        refreshed["affected_volume"] = cluster.count
+        refreshed["avg_amount"] = cluster.avg_amount
+        
+        margin = cluster.avg_amount * MARGIN_RATE
+        cost = cluster.count * REROUTE_COST
+        revenue = cluster.count * margin
+        net = revenue - cost
+        refreshed["cost_analysis"] = (
+            f"Reroute cost: ₹{cost:,.0f} ({cluster.count}×₹{REROUTE_COST:g}). "
+            f"Revenue saved: ₹{revenue:,.0f} ({cluster.count}×₹{margin:,.2f} avg margin). "
+            f"Net: {'+' if net >= 0 else '-'}₹{abs(net):,.0f}"
+        )
+        return refreshed
+    
+    def _cache_decisions(
+        self,
+        decisions: List[Dict[str, Any]],
+        batch: List[Tuple[FailureCluster, Dict[str, Any]]]
+    ):
+        """Store each decision under the cluster (and briefing) it describes"""
+        clusters = [cluster for cluster, _ in batch]
+        calibrations = {id(cluster): cal for cluster, cal in batch}
+        now = time.time()
+        rows = []
+        for decision in decisions:
+            if not isinstance(decision, dict):
+                continue
+            cluster = self._match_cluster(str(decision.get("pattern_detected", "")), clusters, strict=True)
+            if cluster:
+                key = self._cluster_cache_key(cluster, calibrations[id(cluster)])
+                rows.append((key, now, json.dumps(decision, ensure_ascii=False)))
+        
+        if not rows:
+            return
+        try:
+            with self._connect_llm_cache() as conn:
+                conn.executemany("INSERT OR REPLACE INTO cache (key, saved_at, value) VALUES (?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            print(f"   ⚠️  Could not write LLM cache: {e}")
+    
+    def _lookup_llm_cache(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch unexpired cached decisions for the given keys in one query"""
+        if not keys or not os.path.exists(LLM_CACHE_PATH):
+            return {}
+        
+        placeholders = ",".join("?" * len(keys))
+        try:
+            with self._connect_llm_cache() as conn:
+                rows = conn.execute(
+                    f"SELECT key, value FROM cache WHERE key IN ({placeholders}) AND saved_at > ?",
+                    (*keys, time.time() - LLM_CACHE_TTL_SECONDS),
+                ).fetchall()
+        except sqlite3.Error:
+            return {}
+        return {key: json.loads(value) for key, value in rows}
+    
+    @staticmethod
+    @contextmanager
+    def _connect_llm_cache() -> Iterator[sqlite3.Connection]:
+        """Open the LLM cache database (creating its table on first use), commit and close"""
+        Path("data").mkdir(exist_ok=True)
+        conn = sqlite3.connect(LLM_CACHE_PATH, timeout=5.0)
+        try:
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, saved_at REAL NOT NULL, value TEXT NOT NULL)")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
     
     def _classify_pattern_type(self, cluster: FailureCluster) -> str:
         """Classify cluster into pattern type category"""
@@ -1019,9 +1442,12 @@ Return a JSON array of decisions following the format specified in the system pr
         output = {
             "metadata": {
                 "timestamp": datetime.now().isoformat(),
-                "model_used": LLM_MODEL,
+                "model_used": ", ".join(self.model_shards) or "none",
+                "models_used": self.model_shards,
                 "inference_time_seconds": round(time.time() - start_time, 2),
-                "total_decisions": len(decisions)
+                "total_decisions": len(decisions),
+                "decisions_received": self.decisions_received,
+                "llm_cache": {"hits": self.llm_cache_hits, "misses": self.llm_cache_misses}
             },
             "decisions": [d.model_dump() for d in decisions],
             "metrics": metrics.model_dump()
@@ -1030,9 +1456,11 @@ Return a JSON array of decisions following the format specified in the system pr
         # Create data directory if needed
         Path("data").mkdir(exist_ok=True)
         
-        # Save to file with UTF-8 encoding to preserve rupee symbol
-        with open("data/decisions.json", 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+        # orjson writes UTF-8 natively, preserving the rupee symbol. Write to a
+        # temp file and rename so the dashboard never reads a half-written file.
+        tmp_path = Path("data/decisions.json.tmp")
+        tmp_path.write_bytes(orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        tmp_path.replace("data/decisions.json")
         
         return output
 
@@ -3,10 +3,7 @@ Email Utility for SENTINEL
 Sends daily summary reports of system activity
 """
 
-import smtplib
 import json
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 from pathlib import Path
@@ -64,7 +61,11 @@ def send_daily_summary(
         print(f"\n💾 HTML summary saved to: {summary_file}")
         return
     
-    # Send actual email
+    # Send actual email (SMTP/MIME stack imported only when actually sending)
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+
     try:
         smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
         smtp_port = int(os.getenv("SMTP_PORT", "587"))
@@ -9,6 +9,8 @@ from datetime import datetime
 from typing import List, Dict, Any
 from pathlib import Path
 
+import orjson
+
 from models import AgentDecision, ExecutionResult, SafetyOverride, RerouteSession, TransactionDetail
 from safety_validator import validate_decision, create_safety_override
 from email_utils import send_daily_summary
@@ -16,10 +18,17 @@ from config import (
     EXECUTION_LOG_PATH,
     EXECUTION_SUMMARY_PATH,
     TRANSACTION_FLOW_PATH,
-    SAFETY_OVERRIDE_LOG
+    SAFETY_OVERRIDE_LOG,
+    SETTINGS
 )
 
 
+def _write_json(path: str, data: Any) -> None:
+    """Serialize `data` as indented UTF-8 JSON with orjson (datetimes as ISO 8601)."""
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str))
+
+
 class ExecutorAgent:
     """
     The Operator - Executes validated decisions with safety checks
@@ -113,7 +122,6 @@ class ExecutorAgent:
         
         # Simulate reroute execution
         import random
-        from config import REROUTE_COST, MARGIN_RATE
         
         # Determine target provider (simple logic: pick healthiest bank)
         available_banks = ["HDFC", "SBI", "ICICI", "Axis", "Kotak"]
@@ -125,8 +133,8 @@ class ExecutorAgent:
         failed = decision.affected_volume - successful
         
         # Calculate financials
-        cost = decision.affected_volume * REROUTE_COST
-        revenue = successful * decision.avg_amount * MARGIN_RATE
+        cost = decision.affected_volume * SETTINGS.REROUTE_COST
+        revenue = successful * decision.avg_amount * SETTINGS.MARGIN_RATE
         net = revenue - cost
         
         # Create result object
@@ -281,26 +289,22 @@ class ExecutorAgent:
             "execution_time_seconds": round(execution_time, 2)
         }
         
-        with open(EXECUTION_SUMMARY_PATH, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        _write_json(EXECUTION_SUMMARY_PATH, summary)
         
         # File 2: Detailed executions
         executions_data = [e.model_dump() for e in self.executions]
-        with open(EXECUTION_LOG_PATH, 'w', encoding='utf-8') as f:
-            json.dump(executions_data, f, indent=2, ensure_ascii=False, default=str)
+        _write_json(EXECUTION_LOG_PATH, executions_data)
         
         # File 3: Refusals
         refusals_data = [r.model_dump() for r in self.refusals]
-        with open(SAFETY_OVERRIDE_LOG, 'w', encoding='utf-8') as f:
-            json.dump(refusals_data, f, indent=2, ensure_ascii=False, default=str)
+        _write_json(SAFETY_OVERRIDE_LOG, refusals_data)
         
         # File 4: Transaction flow (for animation)
         if self.reroute_sessions:
             flow_data = {
                 "reroute_sessions": [s.model_dump() for s in self.reroute_sessions]
             }
-            with open(TRANSACTION_FLOW_PATH, 'w', encoding='utf-8') as f:
-                json.dump(flow_data, f, indent=2, ensure_ascii=False)
+            _write_json(TRANSACTION_FLOW_PATH, flow_data)
         
         # Send daily summary email
         print(f"\n📧 Sending daily summary email...")
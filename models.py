@@ -5,6 +5,7 @@ Provides type-safe validation with business logic enforcement
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 from datetime import datetime
+from functools import cached_property
 from typing import Optional, List, Literal
 from enum import Enum
 import re
@@ -177,6 +178,11 @@ class FailureCluster(BaseModel):
             f"Errors: {', '.join(self.error_codes)}"
         )
 
+    @cached_property
+    def json_str(self) -> str:
+        """Compact JSON form, serialized once per cluster for LLM prompts"""
+        return self.model_dump_json()
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -1,6 +1,9 @@
 import streamlit as st
 import json
+import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import plotly.graph_objects as go
 
 # --- 1. CSS HACKS FOR "SENTINEL" LOOK ---
@@ -188,16 +191,23 @@ if historical_data:
     # --- PROBLEM ANALYSIS ---
     st.markdown("## Problem Analysis: What Went Wrong?")
     
-    # Load raw transactions for richer analysis
+    # Load raw transactions for richer analysis (only the columns used below)
+    TRANSACTION_COLUMNS = ["bank", "card_type", "status", "timestamp"]
+    
     @st.cache_data
     def load_transactions():
         try:
+            # Prefer the memory-mapped Parquet output; pages are read in as columns are touched
+            if os.path.exists("data/transactions.parquet"):
+                with pa.memory_map("data/transactions.parquet", "r") as source:
+                    return pq.read_table(source, columns=TRANSACTION_COLUMNS).to_pandas()
             with open("data/transactions.json", "r", encoding="utf-8") as f:
-                return json.load(f)
+                return pd.DataFrame(json.load(f), columns=TRANSACTION_COLUMNS)
         except:
-            return []
+            return pd.DataFrame(columns=TRANSACTION_COLUMNS)
     
     transactions = load_transactions()
+    is_failed = transactions["status"] == "FAILED"
     
     col_prob1, col_prob2 = st.columns(2)
     
@@ -206,18 +216,14 @@ if historical_data:
         st.markdown("### Failure Distribution by Bank")
         
         # Aggregate failures by bank from transactions
-        bank_failures = {}
-        bank_totals = {}
-        for txn in transactions:
-            bank = txn.get("bank", "Unknown")
-            bank_totals[bank] = bank_totals.get(bank, 0) + 1
-            if txn.get("status") == "FAILED":
-                bank_failures[bank] = bank_failures.get(bank, 0) + 1
+        bank_totals = transactions["bank"].value_counts()
+        bank_failures = transactions.loc[is_failed, "bank"].value_counts()
+        bank_failures = bank_failures[bank_failures > 0]
         
         # Calculate failure rates
-        banks = sorted(bank_failures.keys(), key=lambda x: bank_failures[x], reverse=True)
-        failure_counts = [bank_failures[b] for b in banks]
-        failure_rates = [(bank_failures[b]/bank_totals[b]*100) if bank_totals[b] > 0 else 0 for b in banks]
+        banks = bank_failures.index.tolist()
+        failure_counts = bank_failures.tolist()
+        failure_rates = (bank_failures / bank_totals[bank_failures.index] * 100).tolist()
         
         fig_banks = go.Figure()
         fig_banks.add_trace(go.Bar(
@@ -247,17 +253,13 @@ if historical_data:
         st.markdown("### Failure Distribution by Card Type")
         
         # Aggregate failures by card type
-        card_failures = {}
-        card_totals = {}
-        for txn in transactions:
-            card = txn.get("card_type", "Unknown")
-            card_totals[card] = card_totals.get(card, 0) + 1
-            if txn.get("status") == "FAILED":
-                card_failures[card] = card_failures.get(card, 0) + 1
-        
-        cards = sorted(card_failures.keys(), key=lambda x: card_failures[x], reverse=True)
-        card_counts = [card_failures[c] for c in cards]
-        card_rates = [(card_failures[c]/card_totals[c]*100) if card_totals[c] > 0 else 0 for c in cards]
+        card_totals = transactions["card_type"].value_counts()
+        card_failures = transactions.loc[is_failed, "card_type"].value_counts()
+        card_failures = card_failures[card_failures > 0]
+        
+        cards = card_failures.index.tolist()
+        card_counts = card_failures.tolist()
+        card_rates = (card_failures / card_totals[card_failures.index] * 100).tolist()
         
         fig_cards = go.Figure()
         fig_cards.add_trace(go.Bar(
@@ -327,18 +329,11 @@ if historical_data:
         st.markdown("### Hourly Failure Timeline")
         
         # Extract hour from timestamps and count failures
-        hourly_failures = {}
-        for txn in transactions:
-            if txn.get("status") == "FAILED":
-                timestamp = txn.get("timestamp", "")
-                try:
-                    hour = int(timestamp.split("T")[1].split(":")[0])
-                    hourly_failures[hour] = hourly_failures.get(hour, 0) + 1
-                except:
-                    pass
+        failed_times = pd.to_datetime(transactions.loc[is_failed, "timestamp"], errors="coerce")
+        hourly_failures = failed_times.dt.hour.value_counts().sort_index()
         
-        hours = sorted(hourly_failures.keys())
-        hour_counts = [hourly_failures[h] for h in hours]
+        hours = hourly_failures.index.astype(int).tolist()
+        hour_counts = hourly_failures.tolist()
         
         fig_hourly = go.Figure()
         fig_hourly.add_trace(go.Scatter(
@@ -481,14 +481,27 @@ def get_failed_transactions(transactions, limit=50):
 # ════════════════════════════════════════════════════════
 #  EMAIL ALERT FUNCTIONS
 # ════════════════════════════════════════════════════════
+@st.cache_resource(show_spinner=False)
+def _smtp_env() -> Dict[str, Optional[str]]:
+    """Recipient and SMTP settings from the environment, resolved once per process."""
+    return {
+        "recipient": os.getenv("RECIPIENT_EMAIL"),
+        "user": os.getenv("SMTP_USER"),
+        "password": os.getenv("SMTP_PASSWORD"),
+        "server": os.getenv("SMTP_SERVER", "smtp.gmail.com"),
+        "port": os.getenv("SMTP_PORT", "587"),
+    }
+
+
 def send_big_transaction_alert(txn: Dict[str, Any], decision: Dict[str, Any]):
     """Send immediate email alert for big transactions (>₹5K)"""
-    recipient = os.getenv("RECIPIENT_EMAIL")
+    env = _smtp_env()
+    recipient = env["recipient"]
     if not recipient:
         return  # Silently skip if no recipient configured
     
-    smtp_user = os.getenv("SMTP_USER")
-    smtp_password = os.getenv("SMTP_PASSWORD")
+    smtp_user = env["user"]
+    smtp_password = env["password"]
     if not smtp_user or not smtp_password:
         return  # Skip if no SMTP configured
     
@@ -607,8 +620,8 @@ This is an automated alert.
     """
     
     try:
-        smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        smtp_port = int(os.getenv("SMTP_PORT", "587"))
+        smtp_server = env["server"]
+        smtp_port = int(env["port"])
         
         msg = MIMEMultipart('alternative')
         msg['Subject'] = subject
@@ -723,7 +736,7 @@ st.title("Live Agent in Action")
 st.markdown("Watch SENTINEL process failed transactions in real-time and make autonomous routing decisions.")
 
 # Show email status
-recipient = os.getenv("RECIPIENT_EMAIL")
+recipient = _smtp_env()["recipient"]
 if recipient:
     st.info(f"Email alerts enabled for transactions >₹5K → {recipient}")
 else:
@@ -9,21 +9,26 @@ import streamlit as st
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 
 
-@st.cache_data(ttl=60)
-def load_decisions():
-    path = os.path.join(DATA_DIR, "decisions.json")
+@st.cache_data(max_entries=16, show_spinner=False)
+def _read_json(path, mtime_ns, size):
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
-@st.cache_data(ttl=60)
+def load_json(path):
+    """Parsed contents of `path`, re-read only when its mtime or size changes."""
+    stat = os.stat(path)
+    return _read_json(path, stat.st_mtime_ns, stat.st_size)
+
+
+def load_decisions():
+    return load_json(os.path.join(DATA_DIR, "decisions.json"))
+
+
 def load_executions():
-    path = os.path.join(DATA_DIR, "execution_summary.json")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return load_json(os.path.join(DATA_DIR, "execution_summary.json"))
 
 
-@st.cache_data(ttl=60)
 def load_all_data():
     decisions = load_decisions()
     executions = load_executions()
@@ -0,0 +1,34 @@
+"""
+utils/formatting.py
+Shared number and label formatting for dashboard components.
+"""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def inr(value: float) -> str:
+    """Rupee amount with thousands separators and no decimals (no ₹ sign)."""
+    return format(value, ",.0f")
+
+
+def model_label(model_id: str) -> str:
+    """Short display name for a Groq model id, e.g. 'llama-3.3-70b-versatile' -> 'Llama 3.3 70B'."""
+    parts = model_id.split("-")
+    if len(parts) >= 3 and parts[0] == "llama":
+        return f"Llama {parts[1]} {parts[2].upper()}"
+    return model_id
+
+
+def models_label(metadata: dict) -> str:
+    """
+    Models behind a council run, from decisions.json metadata. Runs that split
+    shards across tiers list each model with its shard count.
+    """
+    models_used = metadata.get("models_used")
+    if models_used:
+        if len(models_used) == 1:
+            return model_label(next(iter(models_used)))
+        return " + ".join(f"{model_label(m)} ×{n}" for m, n in models_used.items())
+    if models_used == {}:
+        return "No LLM calls"  # every decision came from cache, or nothing to analyze
+    return model_label(metadata.get("model_used", "llama-3.3-70b-versatile"))